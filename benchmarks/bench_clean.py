@@ -0,0 +1,121 @@
+"""
+Time of transcript_cleaner.clean_transcript on hour-long transcripts.
+
+Compares the single-pass cleaner with the original line-by-line
+implementation and checks the output is byte-identical, on the generated
+transcripts and on a randomized corpus of edge cases (CR/CRLF endings,
+unicode whitespace, bare and bracketed timestamps, labels, noise markers).
+
+    python benchmarks/bench_clean.py                   # generated corpus
+    python benchmarks/bench_clean.py --corpus DIR      # also saved *.txt transcripts
+    python benchmarks/bench_clean.py --save DIR        # write the generated corpus
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fixtures import raw_transcript  # noqa: E402
+
+from extractor.transcript_cleaner import clean_transcript  # noqa: E402
+
+# Captions average ~3.75 s, so ~960 make an hour.
+HOUR_CAPTIONS = 960
+
+_SPEAKER_LABEL_RE = re.compile(
+    r"^\s*(speaker|host|guest|agent|user|you|presenter)\s*\d*\s*[:\-]\s*",
+    re.IGNORECASE,
+)
+_TIMESTAMP_INLINE_RE = re.compile(r"(\[?\(?(?:\d{1,2}:)?\d{1,2}:\d{2}(?:,\d{3})?\)?\]?)")
+_METADATA_MARKERS = [
+    re.compile(r"^\s*\[?(music|applause|laughter|silence|background noise)\]?\s*$", re.IGNORECASE),
+    re.compile(r"^\s*generated by.*loom.*transcript.*$", re.IGNORECASE),
+]
+
+def legacy_clean(raw_text):
+    """The implementation this benchmark is measured (and checked) against."""
+    if not raw_text:
+        return ""
+    cleaned_lines = []
+    for line in raw_text.replace("\r\n", "\n").split("\n"):
+        token = line.strip()
+        if token and re.fullmatch(r"(?:\d{1,2}:)?\d{1,2}:\d{2}(?:,\d{1,3})?", token):
+            line = ""
+        else:
+            line = _TIMESTAMP_INLINE_RE.sub("", line)
+        if not line.strip():
+            cleaned_lines.append("")
+            continue
+        line = _SPEAKER_LABEL_RE.sub("", line).strip()
+        if any(rx.match(line.strip()) for rx in _METADATA_MARKERS) or not line:
+            continue
+        line = re.sub(r"\s{2,}", " ", line)
+        cleaned_lines.append(line)
+    text = "\n".join(cleaned_lines)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return re.sub(r"\n{2,}", "\n\n", text).strip()
+
+_PIECES = (
+    "so", "today", "we", "Walk", "through", "  ", " ", "\t", " ", " ", "\x0c", "\r", "\r\n", "\n",
+    "\n\n", "00:12", "1:02:03", "00:12,5", "[00:12]", "(3:45)", "12:34,567", "7:5", ":", "Speaker 1: ",
+    "HOST - ", "guest2:", "You:", "presenter -", "[Music]", "(applause)", "[laughter]", "Silence",
+    "background noise", "Generated by Loom transcript", "generated by loom auto transcript v2", "٣:٤٥",
+)
+
+def fuzz_corpus(count=2000, seed=0):
+    rnd = random.Random(seed)
+    return [
+        (f"fuzz-{i:04d}.txt", "".join(rnd.choice(_PIECES) for _ in range(rnd.randint(0, 60))))
+        for i in range(count)
+    ]
+
+def timed(fn, text, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--corpus", type=str, default=None, help="Directory of saved raw transcripts (*.txt).")
+    ap.add_argument("--save", type=str, default=None, help="Write the generated corpus here and exit.")
+    ap.add_argument("--hours", type=int, default=5, help="Number of hour-long transcripts to time.")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    hours = [(f"hour-{seed}.txt", raw_transcript(seed, HOUR_CAPTIONS)) for seed in range(args.hours)]
+    corpus = hours + fuzz_corpus()
+    if args.corpus:
+        corpus += [(p.name, p.read_text(encoding="utf-8")) for p in sorted(Path(args.corpus).glob("*.txt"))]
+    if args.save:
+        Path(args.save).mkdir(parents=True, exist_ok=True)
+        for name, text in corpus:
+            Path(args.save, name).write_text(text, encoding="utf-8", newline="")
+        print(f"Saved {len(corpus)} transcripts to {args.save}")
+        return
+
+    mismatches = [name for name, text in corpus if legacy_clean(text) != clean_transcript(text)]
+    print(f"golden corpus: {len(corpus)} transcripts, {len(mismatches)} mismatches")
+    for name in mismatches[:10]:
+        print(f"  MISMATCH {name}")
+
+    print(f"{'transcript':<16} {'size':>8} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    for name, text in hours:
+        old_t, _ = timed(legacy_clean, text, args.repeat)
+        new_t, _ = timed(clean_transcript, text, args.repeat)
+        print(f"{name:<16} {len(text) / 1024:>6.0f}kB {old_t * 1e3:>10.2f} {new_t * 1e3:>11.2f} {old_t / new_t:>7.1f}x")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measure bytes on the wire with and without br/zstd negotiation, for each
+transport (requests, httpx HTTP/2, aiohttp), against a local fake Loom.
+
+    python benchmarks/bench_compression.py --videos 200 --filler-kb 200
+
+The fake server answers with zstd, br or gzip (in that order of preference)
+as the client accepts and its own libraries allow. All runs must produce
+identical rows; the script exits non-zero otherwise.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import fake_loom  # noqa: E402
+import fake_loom_h2  # noqa: E402
+from bench_engines import bench  # noqa: E402
+from fixtures import video_id  # noqa: E402
+
+from extractor.http2_client import Http2LoomClient  # noqa: E402
+from extractor.http_pool import TransferStats  # noqa: E402
+from extractor.loom_client import LoomClient  # noqa: E402
+from main import process_one, run_async_engine  # noqa: E402
+from pipeline.engines import run_threaded  # noqa: E402
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--videos", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=16)
+    ap.add_argument("--latency", type=float, default=0.02)
+    ap.add_argument("--filler-kb", type=int, default=200)
+    args = ap.parse_args()
+
+    items = [video_id(i) for i in range(args.videos)] + ["not-a-loom-id"]
+    srv1, url1 = fake_loom.start_in_subprocess(latency=args.latency, filler_kb=args.filler_kb)
+    srv2, url2 = fake_loom_h2.start_in_subprocess(args.latency, args.filler_kb)
+
+    def threaded(make):
+        return lambda ok, err: run_threaded(lambda it: process_one(make(), it), items, args.workers, ok, err)
+
+    runs = []
+    for compression in (False, True):
+        for label, run in (
+            ("requests", lambda kw: threaded(lambda c=LoomClient(base_url=url1, pool_maxsize=args.workers, **kw): c)),
+            ("http2", lambda kw: threaded(
+                lambda c=Http2LoomClient(base_url=url2, pool_maxsize=args.workers, http1=False, **kw): c
+            )),
+            ("aiohttp", lambda kw: lambda ok, err: run_async_engine(dict(kw, base_url=url1), items, args.workers, ok, err)),
+        ):
+            stats = TransferStats()
+            kw = {"user_agent": "bench", "timeout_seconds": 30, "compression": compression, "transfer_stats": stats}
+            rows, errors = bench(f"{label}{'+c' if compression else ''}", run(kw))
+            runs.append((rows, errors))
+            print(f"{'':<9} transfer: {stats.summary(len(rows))}")
+    srv1.terminate()
+    srv2.terminate()
+
+    if any(r != runs[0] for r in runs):
+        print("MISMATCH between runs", file=sys.stderr)
+        sys.exit(1)
+    print("outputs identical")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare the threaded and asyncio fetch engines against a local fake Loom.
+
+    python benchmarks/bench_engines.py --videos 400 --workers 16 --concurrency 300
+    python benchmarks/bench_engines.py --filler-kb 500 --parse-workers 4   # + parse process pool
+
+Both engines must produce identical rows; the script exits non-zero otherwise.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fake_loom import start_in_subprocess  # noqa: E402
+from fixtures import video_id  # noqa: E402
+
+from extractor.loom_client import LoomClient  # noqa: E402
+from main import process_one, run_async_engine  # noqa: E402
+from pipeline.engines import run_threaded  # noqa: E402
+from pipeline.offload import ParsePool  # noqa: E402
+
+def _collect():
+    rows, errors = [], []
+
+    def on_result(original, res):
+        rows.append({"videoId": res[0], "transcript": res[1].text})
+
+    def on_error(original, e):
+        errors.append({"input": original, "error": str(e)})
+
+    return rows, errors, on_result, on_error
+
+def bench(label, run):
+    rows, errors, on_result, on_error = _collect()
+    threads_before = threading.active_count()
+    peak = [threads_before]
+    stop = threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            peak[0] = max(peak[0], threading.active_count())
+            time.sleep(0.01)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    t0 = time.perf_counter()
+    run(on_result, on_error)
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    print(
+        f"{label:<9} {len(rows):>5} ok {len(errors):>4} err  {elapsed:7.2f}s  "
+        f"{len(rows) / elapsed:7.1f} videos/s  peak threads {peak[0]}"
+    )
+    return sorted(rows, key=lambda r: r["videoId"]), sorted(errors, key=lambda e: e["input"])
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--videos", type=int, default=400)
+    ap.add_argument("--workers", type=int, default=16)
+    ap.add_argument("--concurrency", type=int, default=300)
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--filler-kb", type=int, default=5, help="Share page padding; raise to make parsing dominate.")
+    ap.add_argument("--parse-workers", type=int, default=0, help="Also run both engines with a parse process pool.")
+    args = ap.parse_args()
+
+    srv, base_url = start_in_subprocess(latency=args.latency, filler_kb=args.filler_kb)
+    items = [video_id(i) for i in range(args.videos)] + ["not-a-loom-id"]
+    kwargs = {"user_agent": "bench", "timeout_seconds": 30, "base_url": base_url}
+
+    client = LoomClient(pool_maxsize=args.workers, **kwargs)
+    threaded = bench(
+        "threads",
+        lambda ok, err: run_threaded(lambda it: process_one(client, it), items, args.workers, ok, err),
+    )
+    asynced = bench(
+        "async",
+        lambda ok, err: run_async_engine(kwargs, items, args.concurrency, ok, err),
+    )
+    results = [threaded, asynced]
+    if args.parse_workers > 0:
+        pool = ParsePool(args.parse_workers)
+        pooled = dict(kwargs, page_parser=pool)
+        client = LoomClient(pool_maxsize=args.workers, **pooled)
+        results.append(bench(
+            "threads+p",
+            lambda ok, err: run_threaded(lambda it: process_one(client, it, None, pool), items, args.workers, ok, err),
+        ))
+        results.append(bench(
+            "async+p",
+            lambda ok, err: run_async_engine(pooled, items, args.concurrency, ok, err, None, pool),
+        ))
+        pool.close()
+    srv.terminate()
+
+    if any(r != threaded for r in results):
+        print("MISMATCH between engines", file=sys.stderr)
+        sys.exit(1)
+    print("outputs identical")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare the requests (HTTP/1.1) and httpx HTTP/2 transports of the
+threaded engine, each against its own local fake Loom: fake_loom for
+HTTP/1.1 and fake_loom_h2 (cleartext, prior knowledge) for HTTP/2.
+
+    python benchmarks/bench_http2.py --videos 400 --workers 64 --latency 0.05
+
+Both transports must produce identical rows; the script exits non-zero otherwise.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import fake_loom  # noqa: E402
+import fake_loom_h2  # noqa: E402
+from bench_engines import bench  # noqa: E402
+from fixtures import video_id  # noqa: E402
+
+from extractor.http2_client import Http2LoomClient  # noqa: E402
+from extractor.http_pool import ConnectionStats  # noqa: E402
+from extractor.loom_client import LoomClient  # noqa: E402
+from main import process_one  # noqa: E402
+from pipeline.engines import run_threaded  # noqa: E402
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--videos", type=int, default=400)
+    ap.add_argument("--workers", type=int, default=64)
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--filler-kb", type=int, default=5)
+    ap.add_argument("--max-streams", type=int, default=100, help="Concurrent streams the HTTP/2 server allows.")
+    args = ap.parse_args()
+
+    items = [video_id(i) for i in range(args.videos)] + ["not-a-loom-id"]
+    srv1, url1 = fake_loom.start_in_subprocess(latency=args.latency, filler_kb=args.filler_kb)
+    srv2, url2 = fake_loom_h2.start_in_subprocess(args.latency, args.filler_kb, args.max_streams)
+
+    runs = []
+    for label, make in (
+        ("http/1.1", lambda stats: LoomClient("bench", 30, base_url=url1, pool_maxsize=args.workers, connection_stats=stats)),
+        ("http/2", lambda stats: Http2LoomClient("bench", 30, base_url=url2, pool_maxsize=args.workers, connection_stats=stats, http1=False)),
+    ):
+        stats = ConnectionStats()
+        client = make(stats)
+        runs.append(bench(
+            label,
+            lambda ok, err: run_threaded(lambda it: process_one(client, it), items, args.workers, ok, err),
+        ))
+        print(f"{'':<9} connections: {stats.summary()}")
+    srv1.terminate()
+    srv2.terminate()
+
+    if runs[0] != runs[1]:
+        print("MISMATCH between transports", file=sys.stderr)
+        sys.exit(1)
+    print("outputs identical")
+
+if __name__ == "__main__":
+    main()
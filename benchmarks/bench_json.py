@@ -0,0 +1,93 @@
+"""
+Encode/decode throughput of each installed json_backend (orjson, msgspec,
+ujson, stdlib json).
+
+Decodes share-page state blobs (sliced, and as a whole Next.js-style
+script body through json_scan.iter_json_values) and JSON Lines transcript
+rows; encodes the rows as JSON Lines and as the pretty JSON array
+write_json produces. Every backend must decode to the same objects and
+encode to the same bytes as the stdlib; the script exits non-zero
+otherwise.
+
+    python benchmarks/bench_json.py
+    python benchmarks/bench_json.py --rows 500 --captions 3000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fixtures import page_state, raw_transcript, video_id  # noqa: E402
+
+from extractor import json_backend  # noqa: E402
+from extractor.json_scan import iter_json_values  # noqa: E402
+from extractor.transcript_cleaner import clean_transcript  # noqa: E402
+
+# Captions average ~3.75 s, so ~960 make an hour.
+HOUR_CAPTIONS = 960
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=200, help="Hour-long transcript rows to encode/decode.")
+    ap.add_argument("--captions", type=int, default=1200, help="Captions in each share-page state blob.")
+    ap.add_argument("--blobs", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    # Unicode and escapes as real transcripts carry them.
+    extra = ' — “quoted” naïve café 日本語 \\ / \t "x"'
+    blobs = [json.dumps(page_state(seed, args.captions)) for seed in range(args.blobs)]
+    rows = [
+        {"videoId": video_id(i), "transcript": clean_transcript(raw_transcript(i % 10, HOUR_CAPTIONS)) + extra}
+        for i in range(args.rows)
+    ]
+    lines = [json.dumps(r, ensure_ascii=False, separators=(",", ":")) for r in rows]
+    blob_mb = sum(len(b.encode("utf-8")) for b in blobs) / 1e6
+    rows_mb = sum(len(line.encode("utf-8")) for line in lines) / 1e6
+
+    cases = {
+        "decode blobs": (blob_mb, lambda: [json_backend.loads(b) for b in blobs]),
+        "decode script": (blob_mb, lambda: [next(iter_json_values(b)) for b in blobs]),
+        "decode rows": (rows_mb, lambda: [json_backend.loads(line) for line in lines]),
+        "encode rows": (rows_mb, lambda: [json_backend.dumps(r) for r in rows]),
+        "encode pretty": (rows_mb, lambda: json_backend.dumps_pretty(rows)),
+    }
+    print(f"{args.blobs} state blobs ({blob_mb:.1f} MB), {args.rows} transcript rows ({rows_mb:.1f} MB)")
+    print(f"{'backend':<9} " + " ".join(f"{name:>14}" for name in cases) + "   (MB/s, speedup vs json)")
+
+    baseline = {}
+    expected = {}
+    mismatches = []
+    for backend in ["json"] + [b for b in json_backend.available() if b != "json"]:
+        json_backend.use(backend)
+        cells = []
+        for name, (mb, fn) in cases.items():
+            t, result = timed(fn, args.repeat)
+            if backend == "json":
+                baseline[name], expected[name] = t, result
+            elif result != expected[name]:
+                mismatches.append(f"{backend}: {name}")
+            cells.append(f"{mb / t:>7.0f} {baseline[name] / t:>5.1f}x")
+        print(f"{backend:<9} " + " ".join(cells))
+    json_backend.use("auto")
+
+    if mismatches:
+        for m in mismatches:
+            print(f"MISMATCH {m}", file=sys.stderr)
+        sys.exit(1)
+    print("all backends agree with the stdlib")
+
+if __name__ == "__main__":
+    main()
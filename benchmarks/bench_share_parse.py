@@ -0,0 +1,89 @@
+"""
+Per-page parse time of LoomClient._parse_share_page_for_transcript.
+
+Compares the current script scanner with the original BeautifulSoup
+html.parser walk on share-page fixtures and checks both find the same text.
+
+    python benchmarks/bench_share_parse.py                  # generated pages
+    python benchmarks/bench_share_parse.py --pages DIR      # saved *.html pages
+    python benchmarks/bench_share_parse.py --save DIR       # write generated pages
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from fixtures import share_page  # noqa: E402
+
+from extractor.loom_client import LoomClient  # noqa: E402
+
+def legacy_parse(client, html):
+    """The BeautifulSoup-based implementation this benchmark is measured against."""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup.find_all("script"):
+        content = script.string or script.text or ""
+        if not content or "transcript" not in content.lower():
+            continue
+        for blob in client._extract_json_like_strings(content):
+            txt = client._extract_text_from_json_blob(blob)
+            if txt:
+                return txt
+    for node in soup.find_all(string=re.compile(r"\btranscript\b", re.IGNORECASE)):
+        s = str(node)
+        if len(s) > 40:
+            return s
+    return None
+
+def timed(fn, html, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(html)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--pages", type=str, default=None, help="Directory of saved share pages (*.html).")
+    ap.add_argument("--save", type=str, default=None, help="Write the generated pages here and exit.")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.pages:
+        pages = [(p.name, p.read_text(encoding="utf-8")) for p in sorted(Path(args.pages).glob("*.html"))]
+    else:
+        pages = [
+            (f"gen-{kb}kb-{caps}cap.html", share_page(seed, captions_count=caps, filler_kb=kb))
+            for seed, (kb, caps) in enumerate([(20, 60), (200, 300), (800, 1200), (2000, 3000)])
+        ]
+    if args.save:
+        Path(args.save).mkdir(parents=True, exist_ok=True)
+        for name, html in pages:
+            Path(args.save, name).write_text(html, encoding="utf-8")
+        print(f"Saved {len(pages)} pages to {args.save}")
+        return
+
+    client = LoomClient(user_agent="bench")
+    print(f"{'page':<28} {'size':>9} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    mismatches = 0
+    for name, html in pages:
+        old_t, old = timed(lambda h: legacy_parse(client, h), html, args.repeat)
+        new_t, new = timed(client._parse_share_page_for_transcript, html, args.repeat)
+        # Caption lists now come back as Captions; compare their text
+        same = str(old) == str(new)
+        mismatches += not same
+        print(
+            f"{name:<28} {len(html) / 1024:>7.0f}kB {old_t * 1e3:>10.1f} {new_t * 1e3:>11.1f} "
+            f"{old_t / new_t:>7.1f}x{'' if same else '  MISMATCH'}"
+        )
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
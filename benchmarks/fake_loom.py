@@ -0,0 +1,159 @@
+"""
+Local stand-in for www.loom.com used by the benchmarks.
+
+The caption API endpoints answer 404 (as they do for most real videos),
+share pages embed the transcript (and honour If-None-Match) and embed pages
+are empty, so each video costs the same five requests it would against Loom.
+Videos listed in `private` answer 404 everywhere. Every response is
+delayed by `latency` seconds to model network round trips. Share pages are
+sent zstd, br or gzip encoded when the client accepts it (zstd and br only
+if zstandard / brotli are installed here).
+
+    python benchmarks/fake_loom.py --port 8765 --latency 0.05
+"""
+import argparse
+import gzip
+import hashlib
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Set, Tuple
+
+from fixtures import share_page
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Server preference; each entry is (coding, encoder or None if unavailable).
+_ENCODERS = (
+    ("zstd", zstandard and (lambda body: zstandard.ZstdCompressor(level=15).compress(body))),
+    ("br", brotli and (lambda body: brotli.compress(body, quality=9))),
+    ("gzip", lambda body: gzip.compress(body, compresslevel=6)),
+)
+
+_SHARE_RE = re.compile(r"^/share/([a-f0-9]{32})$")
+_HTML = "text/html; charset=utf-8"
+
+class FakeLoomRoutes:
+    """The fake site itself, shared by the HTTP/1.1 and HTTP/2 servers."""
+
+    def __init__(self, latency: float = 0.05, filler_kb: int = 50):
+        self.latency = latency
+        self.filler_kb = filler_kb
+        self.private: Set[str] = set()
+        self._pages = {}
+        self._encoded: Dict[Tuple[str, str], bytes] = {}
+
+    def page_for(self, vid: str) -> str:
+        page = self._pages.get(vid)
+        if page is None:
+            page = self._pages[vid] = share_page(int(vid[:8], 16), filler_kb=self.filler_kb)
+        return page
+
+    def _encode(self, vid: str, body: bytes, accept_encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        accepted = {c.split(";")[0].strip().lower() for c in (accept_encoding or "").split(",")}
+        for coding, encoder in _ENCODERS:
+            if encoder and coding in accepted:
+                key = (vid, coding)
+                if key not in self._encoded:
+                    self._encoded[key] = encoder(body)
+                return coding, self._encoded[key]
+        return None, body
+
+    def respond(
+        self, path: str, if_none_match: Optional[str] = None, accept_encoding: Optional[str] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """(status, headers, body) for a GET of `path`."""
+        m = _SHARE_RE.match(path)
+        if m and m.group(1) in self.private:
+            return 404, {"Content-Type": _HTML}, b"<html><body>Not found</body></html>"
+        if m:
+            body = self.page_for(m.group(1)).encode("utf-8")
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            if if_none_match == etag:
+                return 304, {"ETag": etag}, b""
+            headers = {"Content-Type": _HTML, "ETag": etag, "Vary": "Accept-Encoding"}
+            coding, body = self._encode(m.group(1), body, accept_encoding)
+            if coding:
+                headers["Content-Encoding"] = coding
+            return 200, headers, body
+        if path.startswith("/embed/"):
+            return 200, {"Content-Type": _HTML}, b"<html><body></body></html>"
+        return 404, {"Content-Type": "application/json"}, b'{"error":"not found"}'
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeLoomServer"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.latency)
+        status, headers, body = self.server.respond(
+            self.path, self.headers.get("If-None-Match"), self.headers.get("Accept-Encoding")
+        )
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class FakeLoomServer(FakeLoomRoutes, ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, port: int = 0, latency: float = 0.05, filler_kb: int = 50):
+        ThreadingHTTPServer.__init__(self, ("127.0.0.1", port), _Handler)
+        FakeLoomRoutes.__init__(self, latency, filler_kb)
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients dropping idle keep-alive connections is expected noise.
+        pass
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "FakeLoomServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+def _serve(port: int, latency: float, filler_kb: int, ready) -> None:
+    srv = FakeLoomServer(port, latency, filler_kb)
+    ready.put(srv.server_address[1])
+    srv.serve_forever()
+
+def start_in_subprocess(latency: float = 0.05, filler_kb: int = 50):
+    """
+    Run the server in its own process so its threads and CPU time do not
+    skew measurements taken in the client process. Returns (process, base_url).
+    """
+    import multiprocessing
+
+    ready = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_serve, args=(0, latency, filler_kb, ready), daemon=True)
+    proc.start()
+    return proc, f"http://127.0.0.1:{ready.get(timeout=10)}"
+
+def main(argv: Optional[list] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--filler-kb", type=int, default=50)
+    args = ap.parse_args(argv)
+    srv = FakeLoomServer(args.port, args.latency, args.filler_kb)
+    print(f"Serving fake Loom on {srv.base_url}")
+    srv.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+HTTP/2 (cleartext, prior knowledge) variant of fake_loom for the transport
+benchmark: same routes and pages, served by an asyncio + h2 server so that
+many concurrent requests share one connection as streams.
+
+    python benchmarks/fake_loom_h2.py --port 8766 --latency 0.05
+"""
+import argparse
+import asyncio
+from typing import Dict, Optional
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+
+from fake_loom import FakeLoomRoutes
+
+class _H2Protocol(asyncio.Protocol):
+    def __init__(self, routes: FakeLoomRoutes, max_streams: int):
+        self.routes = routes
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self.conn.local_settings.max_concurrent_streams = max_streams
+        self.transport: Optional[asyncio.Transport] = None
+        self._window_open: Dict[int, asyncio.Event] = {}
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        for ev in self._window_open.values():
+            ev.set()
+
+    def data_received(self, data: bytes) -> None:
+        try:
+            events = self.conn.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self.transport.write(self.conn.data_to_send())
+            self.transport.close()
+            return
+        for ev in events:
+            if isinstance(ev, h2.events.RequestReceived):
+                headers = {k.decode(): v.decode() for k, v in ev.headers}
+                asyncio.ensure_future(self._respond(ev.stream_id, headers))
+            elif isinstance(ev, h2.events.WindowUpdated):
+                targets = self._window_open.values() if ev.stream_id == 0 else [self._window_open.get(ev.stream_id)]
+                for waiter in targets:
+                    if waiter is not None:
+                        waiter.set()
+            elif isinstance(ev, h2.events.StreamReset):
+                waiter = self._window_open.pop(ev.stream_id, None)
+                if waiter is not None:
+                    waiter.set()
+        self.transport.write(self.conn.data_to_send())
+
+    async def _respond(self, stream_id: int, headers: Dict[str, str]) -> None:
+        await asyncio.sleep(self.routes.latency)
+        status, extra, body = self.routes.respond(
+            headers.get(":path", "/"), headers.get("if-none-match"), headers.get("accept-encoding")
+        )
+        response = [(":status", str(status)), ("content-length", str(len(body)))]
+        response += [(k.lower(), v) for k, v in extra.items()]
+        try:
+            self.conn.send_headers(stream_id, response, end_stream=not body)
+            self.transport.write(self.conn.data_to_send())
+            await self._send_body(stream_id, body)
+        except (h2.exceptions.StreamClosedError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            self._window_open.pop(stream_id, None)
+
+    async def _send_body(self, stream_id: int, body: bytes) -> None:
+        pos = 0
+        while pos < len(body):
+            window = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+            if window <= 0:
+                waiter = self._window_open.setdefault(stream_id, asyncio.Event())
+                waiter.clear()
+                await waiter.wait()
+                if self.transport.is_closing():
+                    return
+                continue
+            chunk = body[pos:pos + window]
+            pos += len(chunk)
+            self.conn.send_data(stream_id, chunk, end_stream=pos >= len(body))
+            self.transport.write(self.conn.data_to_send())
+
+async def _serve(port: int, latency: float, filler_kb: int, max_streams: int, ready=None) -> None:
+    routes = FakeLoomRoutes(latency, filler_kb)
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: _H2Protocol(routes, max_streams), "127.0.0.1", port, backlog=1024)
+    bound = server.sockets[0].getsockname()[1]
+    if ready is not None:
+        ready.put(bound)
+    else:
+        print(f"Serving fake Loom (h2c) on http://127.0.0.1:{bound}")
+    async with server:
+        await server.serve_forever()
+
+def _run(port: int, latency: float, filler_kb: int, max_streams: int, ready) -> None:
+    asyncio.run(_serve(port, latency, filler_kb, max_streams, ready))
+
+def start_in_subprocess(latency: float = 0.05, filler_kb: int = 50, max_streams: int = 100):
+    """Like fake_loom.start_in_subprocess; returns (process, base_url)."""
+    import multiprocessing
+
+    ready = multiprocessing.Queue()
+    proc = multiprocessing.Process(
+        target=_run, args=(0, latency, filler_kb, max_streams, ready), daemon=True
+    )
+    proc.start()
+    return proc, f"http://127.0.0.1:{ready.get(timeout=10)}"
+
+def main(argv: Optional[list] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--filler-kb", type=int, default=50)
+    ap.add_argument("--max-streams", type=int, default=100, help="SETTINGS_MAX_CONCURRENT_STREAMS per connection.")
+    args = ap.parse_args(argv)
+    asyncio.run(_serve(args.port, args.latency, args.filler_kb, args.max_streams))
+
+if __name__ == "__main__":
+    main()
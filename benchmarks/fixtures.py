@@ -0,0 +1,79 @@
+"""
+Deterministic Loom-like share pages and transcripts for the benchmarks.
+
+Pages mimic the real layout closely enough for the client's heuristics:
+a few kB of boilerplate markup, several unrelated inline scripts and one
+script that assigns a large JSON state blob containing the captions.
+"""
+import hashlib
+import json
+import random
+
+_WORDS = (
+    "so today we are going to walk through the new dashboard and how you can "
+    "share recordings with your team loom makes it easy to record your screen "
+    "camera and microphone at the same time then send a link"
+).split()
+
+def video_id(n: int) -> str:
+    return hashlib.md5(str(n).encode()).hexdigest()
+
+def captions(seed: int, count: int = 120):
+    rnd = random.Random(seed)
+    t = 0.0
+    out = []
+    for _ in range(count):
+        dur = rnd.uniform(1.5, 6.0)
+        text = " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(6, 18)))
+        out.append({"start": round(t, 3), "end": round(t + dur, 3), "text": text})
+        t += dur
+    return out
+
+def raw_transcript(seed: int, count: int = 120) -> str:
+    """Caption text as Loom's transcript view renders it: timestamps, labels, noise."""
+    lines = []
+    for i, c in enumerate(captions(seed, count)):
+        m, s = divmod(int(c["start"]), 60)
+        lines.append(f"{m:02d}:{s:02d}")
+        speaker = "Speaker 1: " if i % 7 == 0 else ""
+        lines.append(f"{speaker}{c['text']}  [{m}:{s:02d}]")
+        if i % 25 == 0:
+            lines.append("[music]")
+        if i % 10 == 9:
+            lines.append("")
+    return "\n".join(lines)
+
+def page_state(seed: int, captions_count: int = 120) -> dict:
+    """The Apollo state a share page embeds (the blob holding the captions)."""
+    return {
+        "ROOT_QUERY": {"getVideo": {"__ref": f"RegularUserVideo:{seed}"}},
+        f"RegularUserVideo:{seed}": {
+            "id": video_id(seed),
+            "name": "Walkthrough",
+            "description": "Recorded with Loom",
+            "transcript": {"captions": captions(seed, captions_count)},
+        },
+    }
+
+def share_page(seed: int, captions_count: int = 120, filler_kb: int = 200) -> str:
+    rnd = random.Random(seed)
+    state = page_state(seed, captions_count)
+    # Unrelated app state with braces inside strings, like real bundles ship.
+    noise = {
+        f"Feature:{i}": {"flag": rnd.random() > 0.5, "label": "{x} } {", "n": i}
+        for i in range(200)
+    }
+    filler = "".join(
+        f'<div class="c{i}"><span data-i="{i}">{" ".join(rnd.choice(_WORDS) for _ in range(12))}</span></div>\n'
+        for i in range(filler_kb * 1024 // 120)
+    )
+    return (
+        "<!doctype html><html><head><title>Loom</title>"
+        '<script>window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments)}</script>'
+        f"<script>window.__FEATURES__ = {json.dumps(noise)};</script>"
+        "</head><body>"
+        f"{filler}"
+        f"<script>window.__APOLLO_STATE__ = {json.dumps(state)};</script>"
+        '<script src="/static/app.js"></script>'
+        "</body></html>"
+    )
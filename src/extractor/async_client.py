@@ -0,0 +1,255 @@
+import os
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from . import json_backend
+from .http_pool import ConnectionStats, TransferStats, accept_encoding
+from .json_walk import JsonWalker
+from .captions import Captions, Transcript, as_captions
+from .loom_client import LOOM_BASE_URL, LoomError, RetryPolicy, _LoomBase, _NoVerdict, _PageReader
+from .rate_limit import RateLimiter
+from .strategy_stats import StrategyStats
+
+try:
+    import aiohttp
+    from aiohttp import compression_utils
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = compression_utils = None
+
+# Content codings this aiohttp install can decode (br/zstd need extra libraries)
+_DECODERS = {
+    coding
+    for coding, flag in (("br", "HAS_BROTLI"), ("zstd", "HAS_ZSTD"))
+    if getattr(compression_utils, flag, False)
+}
+
+class AsyncLoomClient(_LoomBase):
+    """
+    asyncio counterpart of LoomClient built on aiohttp.
+
+    Runs the same strategies in the same order and shares all parsing
+    heuristics, so a given page yields the same transcript as the threaded
+    client. One instance can serve hundreds of concurrent fetches; callers
+    are expected to bound concurrency themselves (see pipeline.engines).
+    Must be created and closed inside the running event loop.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        timeout_seconds: int = 20,
+        proxy: Optional[str] = None,
+        base_url: str = LOOM_BASE_URL,
+        max_connections: int = 100,
+        strategy_stats: Optional[StrategyStats] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        page_cache: Any = None,
+        json_walker: Optional[JsonWalker] = None,
+        page_parser: Any = None,
+        keep_alive: bool = True,
+        keepalive_seconds: float = 15.0,
+        connection_stats: Optional[ConnectionStats] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        stream_pages: bool = True,
+        max_page_bytes: int = 16 * 1024 * 1024,
+        compression: bool = False,
+        transfer_stats: Optional[TransferStats] = None,
+    ):
+        if aiohttp is None:
+            raise LoomError("The async engine requires aiohttp (pip install aiohttp).")
+
+        self.base_url = base_url.rstrip("/")
+        self.strategy_stats = strategy_stats
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.page_cache = page_cache
+        self.json_walker = json_walker or JsonWalker()
+        self.page_parser = page_parser
+        self.rate_limiter = rate_limiter
+        self.stream_pages = stream_pages
+        self.max_page_bytes = max(1, int(max_page_bytes))
+        self.transfer_stats = transfer_stats
+        headers = {
+            "User-Agent": user_agent or "LoomTranscriptScraper/1.0",
+            "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": accept_encoding(_DECODERS, compression),
+        }
+        bearer = os.getenv("LOOM_TOKEN")
+        if bearer:
+            headers["Authorization"] = f"Bearer {bearer}"
+
+        self.timeout = timeout_seconds
+        self.proxy = proxy or None
+        connector_opts: Dict[str, Any] = {"force_close": True}
+        if keep_alive:
+            connector_opts = {"keepalive_timeout": keepalive_seconds}
+        self.connection_stats = connection_stats
+        trace_configs = []
+        if connection_stats is not None:
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(self._on_request_start)
+            trace.on_connection_create_end.append(self._on_connection_create_end)
+            trace_configs.append(trace)
+        self.session = aiohttp.ClientSession(
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout_seconds),
+            connector=aiohttp.TCPConnector(
+                limit=max_connections, limit_per_host=max_connections, **connector_opts
+            ),
+            trace_configs=trace_configs,
+        )
+
+    async def _on_request_start(self, session: Any, ctx: Any, params: Any) -> None:
+        self.connection_stats.record_request()
+
+    async def _on_connection_create_end(self, session: Any, ctx: Any, params: Any) -> None:
+        self.connection_stats.record_open()
+
+    async def aclose(self) -> None:
+        await self.session.close()
+
+    async def fetch_transcript_text(self, video_id: str) -> str:
+        """
+        Try multiple strategies and return raw transcript text (may contain timestamps/labels).
+        Raises LoomError if nothing workable is found.
+        """
+        return (await self.fetch_transcript(video_id)).text
+
+    async def fetch_transcript(self, video_id: str) -> Captions:
+        """
+        Like fetch_transcript_text, but as Captions (see LoomClient.fetch_transcript).
+        """
+        return (await self.fetch(video_id))[1]
+
+    async def fetch(self, video_id: str) -> Tuple[str, Captions]:
+        """
+        (name of the strategy that found it, Captions); see LoomClient.fetch.
+        """
+        for name, kind, url in self._strategies(video_id):
+            try:
+                if kind == "api":
+                    text = await self._try_fetch_json_transcript(url)
+                else:
+                    text = await self._fetch_page_transcript(url)
+            except _NoVerdict:
+                continue
+            self._record(name, bool(text))
+            if text:
+                return name, as_captions(text)
+
+        raise LoomError("Transcript not found or video is private/unavailable.")
+
+    async def _request_once(
+        self, url: str, headers: Optional[Dict[str, str]], stream: bool = False
+    ) -> "aiohttp.ClientResponse":
+        host = urlsplit(url).netloc
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(host)
+        resp = await self.session.get(url, headers=headers, proxy=self.proxy)
+        if not stream or resp.status >= 300:
+            # Buffer the body so it stays readable after the connection is released.
+            try:
+                self._record_transfer(resp, len(await resp.read()))
+            finally:
+                resp.release()
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(host, resp.status, resp.headers.get("Retry-After"))
+        return resp
+
+    async def _request(
+        self, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False
+    ) -> "aiohttp.ClientResponse":
+        """
+        GET with the client's retry policy applied to this request alone.
+        With `stream`, the body of a 2xx response is left unread (and the
+        caller must release it).
+        """
+        retrying = self.retry_policy.async_retrying(
+            (aiohttp.ClientConnectionError, TimeoutError), lambda resp: resp.status
+        )
+        return await retrying(self._request_once, url, headers, stream)
+
+    async def _try_fetch_json_transcript(self, url: str) -> Optional[Transcript]:
+        # See LoomClient._try_fetch_json_transcript.
+        try:
+            resp = await self._request(url)
+        except (aiohttp.ClientError, TimeoutError) as e:
+            raise _NoVerdict(str(e)) from e
+        if resp.status == 404:
+            return None
+        self._check_throttled(resp.status)
+        if resp.status >= 400:
+            raise _NoVerdict(f"{resp.status} from {url}")
+        try:
+            data = await resp.json(content_type=None, loads=json_backend.loads)
+        except (aiohttp.ClientError, ValueError):
+            return None
+
+        return self._transcript_from_api_payload(data)
+
+    async def _fetch_page_transcript(self, url: str) -> Optional[Transcript]:
+        entry, headers = self._cached_page(url)
+        resp = await self._request(url, headers, stream=self.stream_pages)
+        reader = None
+        try:
+            if resp.status == 304 and entry is not None:
+                return self._stored_page_result(entry)
+            if self.stream_pages:
+                self._check_status(resp)
+                reader = _PageReader(resp.charset or "utf-8", self.max_page_bytes)
+                text = await self._aread_page_stream(url, reader, resp)
+            else:
+                html = await self._check_page(resp)
+                if self.page_parser is not None:
+                    text = await self.page_parser.aparse_page(html)
+                else:
+                    # Parsing blocks the loop; ParsePool keeps it off this thread.
+                    text = self._parse_share_page_for_transcript(html)
+        finally:
+            # The connector drops the connection if the body was not read to the end.
+            resp.release()
+            if reader is not None:
+                self._record_transfer(resp, reader.size)
+        self._remember_page(url, resp.headers, text)
+        return text
+
+    async def _aread_page_stream(
+        self, url: str, reader: _PageReader, resp: "aiohttp.ClientResponse"
+    ) -> Optional[Transcript]:
+        # Async twin of LoomClient._read_page_stream.
+        async for chunk in resp.content.iter_chunked(self.PAGE_CHUNK):
+            for content in reader.feed(chunk):
+                txt = await self._aparse_script(content)
+                if txt:
+                    return txt
+            if reader.truncated:
+                break
+        else:
+            for content in reader.finish():
+                txt = await self._aparse_script(content)
+                if txt:
+                    return txt
+        return reader.fallback(url)
+
+    async def _aparse_script(self, content: str) -> Optional[Transcript]:
+        if self.page_parser is not None:
+            return await self.page_parser.aparse_script(content)
+        return self._parse_script_for_transcript(content)
+
+    def _record_transfer(self, resp: "aiohttp.ClientResponse", decoded: int) -> None:
+        if self.transfer_stats is not None:
+            # Bytes before content decoding (older aiohttp only counts decoded ones)
+            wire = getattr(resp.content, "total_raw_bytes", resp.content.total_bytes)
+            self.transfer_stats.record(resp.url, resp.headers.get("Content-Encoding"), wire, decoded)
+
+    def _check_status(self, resp: "aiohttp.ClientResponse") -> None:
+        if resp.status in (401, 403, 404):
+            raise LoomError(f"Unavailable: {resp.status}")
+        if resp.status >= 400:
+            raise self._status_error(resp.status, resp.reason, resp.url)
+
+    async def _check_page(self, resp: "aiohttp.ClientResponse") -> str:
+        self._check_status(resp)
+        return await resp.text()
+
+    async def _get(self, url: str) -> str:
+        return await self._check_page(await self._request(url))
@@ -0,0 +1,172 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id    TEXT PRIMARY KEY,
+    raw         TEXT NOT NULL,
+    cleaned     TEXT NOT NULL,
+    segments    BLOB,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transcripts_accessed ON transcripts (accessed_at);
+CREATE TABLE IF NOT EXISTS pages (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    result        TEXT,
+    segments      BLOB,
+    size          INTEGER NOT NULL,
+    accessed_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at);
+"""
+
+# Columns added since the first schema: (table, column, type).
+_ADDED_COLUMNS = (("transcripts", "segments", "BLOB"), ("pages", "segments", "BLOB"))
+
+_TOTAL_SQL = (
+    "SELECT (SELECT COALESCE(SUM(size), 0) FROM transcripts)"
+    " + (SELECT COALESCE(SUM(size), 0) FROM pages)"
+)
+
+class TranscriptCache:
+    """
+    On-disk transcript cache keyed by normalized Loom video ID.
+
+    Stores both the raw text returned by LoomClient.fetch_transcript_text and
+    the clean_transcript output in one SQLite file under `cache_dir`, with
+    the caption timing of the cleaned text (Captions.pack) when it had any.
+    Entries older than `ttl_seconds` are treated as misses (None/0 disables
+    expiry). When the stored text exceeds `max_bytes`, least recently used
+    entries are evicted. Safe to share between threads.
+
+    It also keeps HTTP validators (ETag / Last-Modified) for share and embed
+    pages together with the transcript (and its timing) parsed from them,
+    so a conditional refetch answered with 304 can reuse that result. Page
+    entries count towards `max_bytes` but do not expire: the server decides
+    freshness.
+    """
+
+    FILENAME = "transcripts.sqlite3"
+
+    def __init__(self, cache_dir: Path, ttl_seconds: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.path = Path(cache_dir) / self.FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = float(ttl_seconds) if ttl_seconds else None
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._total = self._conn.execute(_TOTAL_SQL).fetchone()[0]
+
+    def _migrate(self) -> None:
+        # Files written before a column existed get it added (as NULLs).
+        for table, column, kind in _ADDED_COLUMNS:
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+
+    def get(self, video_id: str) -> Optional[Tuple[str, str, Optional[bytes]]]:
+        """
+        Return (raw, cleaned, segments) for a fresh entry, or None.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT raw, cleaned, segments, created_at FROM transcripts WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None or (self.ttl is not None and now - row[3] > self.ttl):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE transcripts SET accessed_at = ? WHERE video_id = ?", (now, video_id))
+            self.hits += 1
+            return row[0], row[1], row[2]
+
+    def put(self, video_id: str, raw: str, cleaned: str, segments: Optional[bytes] = None) -> None:
+        size = len(raw.encode("utf-8")) + len(cleaned.encode("utf-8")) + len(segments or b"")
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM transcripts WHERE video_id = ?", (video_id,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (video_id, raw, cleaned, segments, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (video_id, raw, cleaned, segments, size, now, now),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self.max_bytes is not None and self._total > self.max_bytes:
+                self._evict()
+
+    def get_page(
+        self, url: str
+    ) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], Optional[bytes]]]:
+        """
+        Return (etag, last_modified, parse_result, segments) stored for a page URL, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, result, segments FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            return row
+
+    def put_page(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        result: Optional[str],
+        segments: Optional[bytes] = None,
+    ) -> None:
+        size = len(url) + len((result or "").encode("utf-8")) + len(segments or b"")
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM pages WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, result, segments, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, result, segments, size, time.time()),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self.max_bytes is not None and self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds the lock. Another process may share the file, so
+        # resync the total before deciding how much to drop.
+        self._total = self._conn.execute(_TOTAL_SQL).fetchone()[0]
+        if self.ttl is not None:
+            cur = self._conn.execute("DELETE FROM transcripts WHERE created_at < ?", (time.time() - self.ttl,))
+            if cur.rowcount:
+                self._total = self._conn.execute(_TOTAL_SQL).fetchone()[0]
+        if self._total <= self.max_bytes:
+            return
+        victims = {"transcripts": [], "pages": []}
+        excess = self._total - self.max_bytes
+        rows = self._conn.execute(
+            "SELECT 'transcripts', video_id, size, accessed_at FROM transcripts"
+            " UNION ALL SELECT 'pages', url, size, accessed_at FROM pages"
+            " ORDER BY accessed_at"
+        )
+        for table, key, size, _ in rows:
+            victims[table].append((key,))
+            excess -= size
+            self._total -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM transcripts WHERE video_id = ?", victims["transcripts"])
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", victims["pages"])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,180 @@
+import re
+from array import array
+from typing import Any, Iterable, Iterator, Optional, Tuple, Union
+
+# Start/end of a segment whose source had no (usable) timing.
+NO_TIME = -1
+
+# Caption keys holding times, first match wins; *Ms / *_ms are milliseconds,
+# everything else seconds (numbers) or a clock string.
+_START_KEYS = ("startMs", "start_ms", "start", "startTime", "start_time", "begin", "ts", "time", "offset")
+_END_KEYS = ("endMs", "end_ms", "end", "endTime", "end_time")
+_DURATION_KEYS = ("durationMs", "duration_ms", "duration", "dur")
+_CLOCK_RE = re.compile(r"(?:(\d+):)?(\d{1,2}):(\d{1,2}(?:[.,]\d{1,3})?)")
+# A cue with no end lasts until the next one starts, or this long.
+_DEFAULT_CUE_MS = 3000
+
+Segment = Tuple[int, int, str]
+
+def _millis(value: Any, key: str) -> int:
+    if isinstance(value, bool) or value is None:
+        return NO_TIME
+    scale = 1 if key.endswith(("Ms", "_ms")) else 1000
+    if isinstance(value, str):
+        m = _CLOCK_RE.fullmatch(value.strip())
+        if m:
+            hours, minutes, seconds = m.groups()
+            value = int(hours or 0) * 3600 + int(minutes) * 60 + float(seconds.replace(",", "."))
+            scale = 1000
+        else:
+            try:
+                value = float(value)
+            except ValueError:
+                return NO_TIME
+    if not isinstance(value, (int, float)) or value < 0 or value != value:
+        return NO_TIME
+    return int(round(value * scale))
+
+def _first_time(caption: dict, keys: Tuple[str, ...]) -> int:
+    for key in keys:
+        if key in caption:
+            ms = _millis(caption[key], key)
+            if ms != NO_TIME:
+                return ms
+    return NO_TIME
+
+def caption_segment(caption: dict) -> Optional[Segment]:
+    """(start_ms, end_ms, text) of one caption object, or None if it has no text."""
+    text = caption.get("text") or caption.get("caption")
+    if not isinstance(text, str) or not text:
+        return None
+    start = _first_time(caption, _START_KEYS)
+    end = _first_time(caption, _END_KEYS)
+    if end == NO_TIME and start != NO_TIME:
+        duration = _first_time(caption, _DURATION_KEYS)
+        if duration != NO_TIME:
+            end = start + duration
+    return start, end, text
+
+def _clock(ms: int, sep: str) -> str:
+    seconds, ms = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{sep}{ms:03d}"
+
+class Captions:
+    """
+    A transcript as timed segments over one shared text buffer.
+
+    Segment i is buffer[lo[i]:hi[i]], shown from starts[i] to ends[i]
+    (milliseconds, NO_TIME where the source had none). The four columns are
+    machine-int arrays, so a transcript costs one string plus 32 bytes per
+    segment rather than a dict and a str per caption. Segment texts and the
+    plain text are sliced out only when asked for; segments are separated
+    in the buffer by newlines, so `text` is what joining the captions
+    would give.
+    """
+
+    __slots__ = ("buffer", "starts", "ends", "lo", "hi")
+
+    def __init__(self, buffer: str, starts: array, ends: array, lo: array, hi: array):
+        self.buffer = buffer
+        self.starts = starts
+        self.ends = ends
+        self.lo = lo
+        self.hi = hi
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment]) -> "Captions":
+        starts, ends, lo, hi = array("q"), array("q"), array("q"), array("q")
+        texts = []
+        pos = 0
+        for start, end, text in segments:
+            starts.append(start)
+            ends.append(end)
+            lo.append(pos)
+            pos += len(text)
+            hi.append(pos)
+            pos += 1
+            texts.append(text)
+        return cls("\n".join(texts), starts, ends, lo, hi)
+
+    @classmethod
+    def from_text(cls, text: str) -> "Captions":
+        """Untimed text as a single segment (no copy of `text`)."""
+        return cls(text, array("q", (NO_TIME,)), array("q", (NO_TIME,)), array("q", (0,)), array("q", (len(text),)))
+
+    @property
+    def text(self) -> str:
+        return self.buffer.strip()
+
+    @property
+    def timed(self) -> bool:
+        """Whether any segment has a start time (i.e. can be exported as subtitles)."""
+        return any(start != NO_TIME for start in self.starts)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Segment]:
+        buf = self.buffer
+        for start, end, lo, hi in zip(self.starts, self.ends, self.lo, self.hi):
+            yield start, end, buf[lo:hi]
+
+    def __bool__(self) -> bool:
+        return bool(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"Captions({len(self)} segments, {len(self.buffer)} chars, timed={self.timed})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Captions):
+            return NotImplemented
+        return (self.buffer, self.starts, self.ends, self.lo, self.hi) == (
+            other.buffer, other.starts, other.ends, other.lo, other.hi
+        )
+
+    def pack(self) -> bytes:
+        """The segment columns as bytes; Captions.unpack(buffer, blob) restores them."""
+        return self.starts.tobytes() + self.ends.tobytes() + self.lo.tobytes() + self.hi.tobytes()
+
+    @classmethod
+    def unpack(cls, buffer: str, blob: Optional[bytes]) -> "Captions":
+        if blob is None:
+            return cls.from_text(buffer)
+        cols = array("q")
+        cols.frombytes(blob)
+        n = len(cols) // 4
+        return cls(buffer, cols[:n], cols[n:2 * n], cols[2 * n:3 * n], cols[3 * n:])
+
+    def cues(self) -> Iterator[Tuple[int, int, str]]:
+        """Timed segments with an end filled in; blank lines inside a text are dropped."""
+        timed = [(s, e, t) for s, e, t in self if s != NO_TIME]
+        for i, (start, end, text) in enumerate(timed):
+            if end == NO_TIME or end <= start:
+                nxt = timed[i + 1][0] if i + 1 < len(timed) else NO_TIME
+                end = nxt if nxt > start else start + _DEFAULT_CUE_MS
+            lines = [line for line in text.split("\n") if line.strip()]
+            if lines:
+                yield start, end, "\n".join(lines)
+
+    def to_srt(self) -> str:
+        return "".join(
+            f"{n}\n{_clock(start, ',')} --> {_clock(end, ',')}\n{text}\n\n"
+            for n, (start, end, text) in enumerate(self.cues(), 1)
+        )
+
+    def to_vtt(self) -> str:
+        return "WEBVTT\n\n" + "".join(
+            f"{_clock(start, '.')} --> {_clock(end, '.')}\n{text}\n\n" for start, end, text in self.cues()
+        )
+
+# What the parsing heuristics produce: timed captions, or plain text when
+# the source had no caption structure.
+Transcript = Union[str, Captions]
+
+def as_captions(transcript: Transcript) -> Captions:
+    return transcript if isinstance(transcript, Captions) else Captions.from_text(transcript)
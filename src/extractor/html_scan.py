@@ -0,0 +1,112 @@
+import re
+from typing import Iterator, List, Optional
+
+try:
+    import lxml.html as _lxml_html
+except ImportError:  # pragma: no cover - optional dependency
+    _lxml_html = None
+
+# Script bodies are raw text up to the first "</script": the same rule the
+# HTML tokenizer (and so BeautifulSoup's html.parser) applies.
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+_TRANSCRIPT_RE = re.compile(r"transcript", re.IGNORECASE)
+# _SCRIPT_RE split in two for incremental scanning.
+_SCRIPT_START_RE = re.compile(r"<script\b", re.IGNORECASE)
+_SCRIPT_OPEN_RE = re.compile(r"<script\b[^>]*>", re.IGNORECASE)
+_SCRIPT_CLOSE_RE = re.compile(r"</script\s*>", re.IGNORECASE)
+_TRANSCRIPT_WORD_RE = re.compile(r"\btranscript\b", re.IGNORECASE)
+
+def iter_transcript_scripts(html: str) -> Iterator[str]:
+    """
+    Yield the bodies of inline <script> tags that mention "transcript",
+    in document order, by scanning the raw markup (no tree is built).
+    """
+    for m in _SCRIPT_RE.finditer(html):
+        body = m.group(1)
+        if body and _TRANSCRIPT_RE.search(body):
+            yield body
+
+class ScriptScanner:
+    """
+    Incremental iter_transcript_scripts for a page arriving in pieces.
+
+    feed() takes the next decoded chunk and returns the bodies of
+    transcript-mentioning scripts whose closing tag has now arrived, in
+    document order and exactly as iter_transcript_scripts would find them
+    in the whole page. Only the unfinished tail is rescanned; the page read
+    so far is kept for the text-node fallback (see `html`).
+    """
+
+    def __init__(self) -> None:
+        self._parts: List[str] = []
+        self._buf = ""
+        self._body = -1  # start of the open script's body in _buf
+        self._resume = 0  # no closing tag starts before this index of _buf
+
+    @property
+    def html(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> List[str]:
+        self._parts.append(chunk)
+        buf = self._buf + chunk
+        found = []
+        pos = 0
+        while True:
+            if self._body < 0:
+                m = _SCRIPT_OPEN_RE.search(buf, pos)
+                if m is None:
+                    # Keep an unfinished opening tag, or what may begin one.
+                    start = _SCRIPT_START_RE.search(buf, pos)
+                    keep = start.start() if start else max(pos, len(buf) - len("<script"))
+                    break
+                self._body = self._resume = m.end()
+            close = _SCRIPT_CLOSE_RE.search(buf, self._resume)
+            if close is None:
+                # A closing tag that completes later starts at the last "<".
+                last = buf.rfind("<", self._resume)
+                self._resume = last if last >= 0 else len(buf)
+                keep = self._body
+                break
+            body = buf[self._body:close.start()]
+            if body and _TRANSCRIPT_RE.search(body):
+                found.append(body)
+            pos = close.end()
+            self._body = -1
+        self._buf = buf[keep:]
+        if self._body >= 0:
+            self._body -= keep
+            self._resume -= keep
+        return found
+
+def find_transcript_text_node(html: str, min_length: int = 40) -> Optional[str]:
+    """
+    Last-resort heuristic: the first text node mentioning the word
+    "transcript" that is longer than `min_length` characters.
+
+    Skips parsing entirely when the word does not occur in the document.
+    Uses lxml when installed and BeautifulSoup otherwise (lxml does not
+    report comment nodes; BeautifulSoup does).
+    """
+    if not _TRANSCRIPT_WORD_RE.search(html):
+        return None
+
+    if _lxml_html is not None:
+        try:
+            texts = _lxml_html.document_fromstring(html).itertext()
+        except (ValueError, TypeError):
+            texts = None
+        if texts is not None:
+            for s in texts:
+                if len(s) > min_length and _TRANSCRIPT_WORD_RE.search(s):
+                    return s
+            return None
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for node in soup.find_all(string=_TRANSCRIPT_WORD_RE):
+        s = str(node)
+        if len(s) > min_length:
+            return s
+    return None
@@ -0,0 +1,234 @@
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Dict, Iterable, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from . import json_backend
+from .captions import Transcript
+from .http_pool import ConnectionStats, TransferStats, accept_encoding
+from .json_walk import JsonWalker
+from .loom_client import LOOM_BASE_URL, LoomClient, LoomError, RetryPolicy, _NoVerdict
+from .rate_limit import RateLimiter
+from .strategy_stats import StrategyStats
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+except ImportError:  # pragma: no cover - optional dependency
+    h2 = None
+
+try:
+    import brotli  # noqa: F401  (httpx decodes br with it, or with brotlicffi)
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as brotli  # noqa: F401
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard  # noqa: F401  (httpx decodes zstd with it)
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Content codings this httpx install can decode (br/zstd need extra libraries)
+_DECODERS = {
+    coding for coding, lib in (("br", brotli), ("zstd", zstandard)) if lib is not None
+}
+
+T = TypeVar("T")
+
+class _LoopThread:
+    """An asyncio event loop on a daemon thread that other threads hand coroutines to."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="http2-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run `coro` on the loop and block the calling thread for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+async def _next_chunk(chunks: Any) -> Optional[bytes]:
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return None
+
+async def _close_chunks(chunks: Any) -> None:
+    await chunks.aclose()
+
+class Http2LoomClient(LoomClient):
+    """
+    LoomClient over httpx with HTTP/2 enabled.
+
+    Same strategies, parsing and fetch_transcript(_text) interface; only the
+    transport differs. Requests from all worker threads are multiplexed as
+    streams over a few connections instead of one TCP+TLS connection per
+    thread; another connection (up to `pool_maxsize`) is opened only when
+    the server's concurrent-stream limit is reached.
+    httpx's sync HTTP/2 connection is not safe to share between threads, so
+    the connections belong to an httpx.AsyncClient on one event-loop thread
+    and worker threads block on the requests they hand to it.
+    HTTP/2 is negotiated with ALPN on https URLs; `http1=False` forces
+    prior-knowledge HTTP/2 on cleartext URLs (the local benchmark server).
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        timeout_seconds: int = 20,
+        proxy: Optional[str] = None,
+        base_url: str = LOOM_BASE_URL,
+        strategy_stats: Optional[StrategyStats] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        page_cache: Any = None,
+        json_walker: Optional[JsonWalker] = None,
+        page_parser: Any = None,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        keepalive_seconds: float = 15.0,
+        connection_stats: Optional[ConnectionStats] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        http1: bool = True,
+        stream_pages: bool = True,
+        max_page_bytes: int = 16 * 1024 * 1024,
+        compression: bool = False,
+        transfer_stats: Optional[TransferStats] = None,
+    ):
+        if httpx is None or h2 is None:
+            raise LoomError("The http2 transport requires httpx and h2 (pip install 'httpx[http2]').")
+
+        self.base_url = base_url.rstrip("/")
+        self.strategy_stats = strategy_stats
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.page_cache = page_cache
+        self.json_walker = json_walker or JsonWalker()
+        self.page_parser = page_parser
+        self.connection_stats = connection_stats
+        self.rate_limiter = rate_limiter
+        self.stream_pages = stream_pages
+        self.max_page_bytes = max(1, int(max_page_bytes))
+        self.transfer_stats = transfer_stats
+        headers = {
+            "User-Agent": user_agent or "LoomTranscriptScraper/1.0",
+            "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": accept_encoding(_DECODERS, compression),
+        }
+        bearer = os.getenv("LOOM_TOKEN")
+        if bearer:
+            headers["Authorization"] = f"Bearer {bearer}"
+
+        self.timeout = timeout_seconds
+        # Connection: close is not allowed in HTTP/2; drop idle connections instead.
+        limits = httpx.Limits(
+            max_connections=max(1, pool_maxsize),
+            max_keepalive_connections=max(1, pool_maxsize) if keep_alive else 0,
+            keepalive_expiry=keepalive_seconds if keep_alive else 0,
+        )
+        self._loop = _LoopThread()
+        self.session = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout_seconds,
+            proxy=proxy or None,
+            limits=limits,
+            http1=http1,
+            http2=True,
+        )
+        self._extensions = {"trace": self._trace} if connection_stats is not None else {}
+
+    def close(self) -> None:
+        self._loop.run(self.session.aclose())
+        self._loop.stop()
+
+    async def _trace(self, name: str, info: Dict[str, Any]) -> None:
+        if name == "connection.connect_tcp.complete":
+            self.connection_stats.record_open()
+
+    async def _asend(self, url: str, headers: Optional[Dict[str, str]], stream: bool) -> "httpx.Response":
+        req = self.session.build_request("GET", url, headers=headers, extensions=self._extensions)
+        resp = await self.session.send(req, stream=stream)
+        if stream and resp.status_code >= 300:
+            await resp.aread()
+        return resp
+
+    def _send(self, url: str, headers: Optional[Dict[str, str]], stream: bool = False) -> "httpx.Response":
+        host = urlsplit(url).netloc
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(host)
+        if self.connection_stats is not None:
+            self.connection_stats.record_request()
+        resp = self._loop.run(self._asend(url, headers, stream))
+        if not stream or resp.status_code >= 300:
+            self._record_transfer(resp, len(resp.content))
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(host, resp.status_code, resp.headers.get("Retry-After"))
+        return resp
+
+    def _request(
+        self, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False
+    ) -> "httpx.Response":
+        """
+        GET with the client's retry policy applied to this request alone.
+        With `stream`, the body of a 2xx response is left unread.
+        """
+        retrying = self.retry_policy.retrying((httpx.TransportError,), lambda resp: resp.status_code)
+        return retrying(self._send, url, headers, stream)
+
+    def _try_fetch_json_transcript(self, url: str) -> Optional[Transcript]:
+        # See LoomClient._try_fetch_json_transcript.
+        try:
+            resp = self._request(url)
+        except httpx.HTTPError as e:
+            raise _NoVerdict(str(e)) from e
+        if resp.status_code == 404:
+            return None
+        self._check_throttled(resp.status_code)
+        if resp.status_code >= 400:
+            raise _NoVerdict(f"{resp.status_code} from {url}")
+        try:
+            data = json_backend.loads(resp.content)
+        except ValueError:
+            return None
+
+        return self._transcript_from_api_payload(data)
+
+    def _iter_body(self, resp: "httpx.Response") -> Iterable[bytes]:
+        # Each chunk is read on the loop thread; a page abandoned part way
+        # closes its iterator there too.
+        chunks = resp.aiter_bytes(self.PAGE_CHUNK)
+        try:
+            while True:
+                chunk = self._loop.run(_next_chunk(chunks))
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self._loop.run(_close_chunks(chunks))
+
+    def _release(self, resp: "httpx.Response") -> None:
+        self._loop.run(resp.aclose())
+
+    def _body_encoding(self, resp: "httpx.Response") -> str:
+        return resp.charset_encoding or "utf-8"
+
+    def _wire_bytes(self, resp: "httpx.Response") -> int:
+        return resp.num_bytes_downloaded
+
+    def _check_status(self, resp: "httpx.Response") -> None:
+        if resp.status_code in (401, 403, 404):
+            raise LoomError(f"Unavailable: {resp.status_code}")
+        if resp.status_code >= 400:
+            # HTTP/2 carries no reason phrase
+            reason = resp.reason_phrase or httpx.codes.get_reason_phrase(resp.status_code)
+            raise self._status_error(resp.status_code, reason, resp.url)
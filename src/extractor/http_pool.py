@@ -0,0 +1,135 @@
+import logging
+import threading
+from typing import Any, Collection, Dict, Optional
+
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+class ConnectionStats:
+    """
+    Requests sent and connections opened over a run; every request that did
+    not open a connection reused a kept-alive one. Shared by all workers.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reused(self) -> int:
+        return max(0, self.requests - self.opened)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_open(self) -> None:
+        with self._lock:
+            self.opened += 1
+
+    def summary(self) -> str:
+        return f"{self.opened} opened, {self.reused} reused ({self.requests} requests)"
+
+def accept_encoding(decoders: Collection[str], compression: bool = False) -> str:
+    """
+    Accept-Encoding for a transport that can decode `decoders`. gzip and
+    deflate are always accepted; br and zstd only with `compression` and
+    when the transport has the library to decode them.
+    """
+    codings = ["gzip", "deflate"]
+    if compression:
+        codings += [c for c in ("br", "zstd") if c in decoders]
+    return ", ".join(codings)
+
+def _size(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+class TransferStats:
+    """
+    Response body bytes as received (still content-encoded) and as decoded,
+    per Content-Encoding, over a run. Shared by all workers; each response
+    is also logged at DEBUG level.
+    """
+
+    def __init__(self) -> None:
+        self.responses = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.encodings: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, url: Any, encoding: Optional[str], wire: int, decoded: int) -> None:
+        encoding = (encoding or "identity").strip().lower()
+        with self._lock:
+            self.responses += 1
+            self.wire_bytes += wire
+            self.decoded_bytes += decoded
+            self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+        logger.debug("%s: %d bytes received, %d decoded (%s)", url, wire, decoded, encoding)
+
+    def summary(self, transcripts: int = 0) -> str:
+        ratio = self.decoded_bytes / self.wire_bytes if self.wire_bytes else 1.0
+        encodings = ", ".join(f"{enc} {n}" for enc, n in sorted(self.encodings.items())) or "no responses"
+        text = f"{_size(self.wire_bytes)} received, {_size(self.decoded_bytes)} decoded ({ratio:.1f}x; {encodings})"
+        if transcripts:
+            text += f", {_size(self.wire_bytes / transcripts)} per transcript"
+        return text
+
+def _counting_pool(base: type, stats: ConnectionStats) -> type:
+    # Count socket connects rather than _new_conn calls: urllib3 reconnects
+    # a pooled connection object in place once the server has closed it.
+    conn_base = base.ConnectionCls
+
+    def connect(self):
+        stats.record_open()
+        return conn_base.connect(self)
+
+    conn_cls = type(conn_base.__name__, (conn_base,), {"connect": connect})
+    return type(base.__name__, (base,), {"ConnectionCls": conn_cls})
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose per-host pool keeps `pool_maxsize` connections (size
+    it to the worker count: a smaller pool makes threads open connections
+    only to discard them on return, "Connection pool is full"). With
+    `connection_stats` every request and every newly opened connection is
+    counted.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        connection_stats: Optional[ConnectionStats] = None,
+    ):
+        self.connection_stats = connection_stats
+        super().__init__(pool_connections=10, pool_maxsize=max(1, pool_maxsize), pool_block=pool_block)
+
+    def _count(self, manager: Any) -> Any:
+        if self.connection_stats is not None:
+            # Wrap whatever pool classes the manager uses (SOCKS has its own).
+            manager.pool_classes_by_scheme = {
+                scheme: _counting_pool(cls, self.connection_stats)
+                for scheme, cls in manager.pool_classes_by_scheme.items()
+            }
+        return manager
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self._count(self.poolmanager)
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> Any:
+        if proxy not in self.proxy_manager:
+            self._count(super().proxy_manager_for(proxy, **proxy_kwargs))
+        return self.proxy_manager[proxy]
+
+    def send(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        if self.connection_stats is not None:
+            self.connection_stats.record_request()
+        return super().send(request, *args, **kwargs)
@@ -0,0 +1,111 @@
+import functools
+import json
+import logging
+from typing import Any, Callable, Dict, List, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+logger = logging.getLogger(__name__)
+
+# In order of preference for "auto".
+BACKENDS = ("orjson", "msgspec", "ujson", "json")
+
+def _stdlib() -> Dict[str, Callable]:
+    compact = functools.partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+    return {
+        "loads": json.loads,
+        "dumps": compact,
+        "dumps_pretty": functools.partial(json.dumps, ensure_ascii=False, indent=2),
+        "dumpb": lambda obj: compact(obj).encode("utf-8"),
+    }
+
+def _orjson() -> Dict[str, Callable]:
+    return {
+        "loads": orjson.loads,
+        "dumps": lambda obj: orjson.dumps(obj).decode("utf-8"),
+        "dumps_pretty": lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8"),
+        "dumpb": orjson.dumps,
+    }
+
+def _msgspec() -> Dict[str, Callable]:
+    encode = msgspec.json.Encoder().encode
+    decode = msgspec.json.Decoder().decode
+
+    def loads(s: Union[str, bytes]) -> Any:
+        # Callers catch ValueError, as raised by every other backend.
+        try:
+            return decode(s)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+
+    return {
+        "loads": loads,
+        "dumps": lambda obj: encode(obj).decode("utf-8"),
+        "dumps_pretty": lambda obj: msgspec.json.format(encode(obj), indent=2).decode("utf-8"),
+        "dumpb": encode,
+    }
+
+def _ujson() -> Dict[str, Callable]:
+    compact = functools.partial(ujson.dumps, ensure_ascii=False, escape_forward_slashes=False)
+    return {
+        "loads": ujson.loads,
+        "dumps": compact,
+        "dumps_pretty": functools.partial(ujson.dumps, ensure_ascii=False, escape_forward_slashes=False, indent=2),
+        "dumpb": lambda obj: compact(obj).encode("utf-8"),
+    }
+
+_FACTORIES = {
+    "orjson": (lambda: orjson, _orjson),
+    "msgspec": (lambda: msgspec, _msgspec),
+    "ujson": (lambda: ujson, _ujson),
+    "json": (lambda: json, _stdlib),
+}
+
+def available() -> List[str]:
+    return [b for b in BACKENDS if _FACTORIES[b][0]() is not None]
+
+# The active backend and its functions; bound by use().
+name: str
+loads: Callable[[Union[str, bytes]], Any]
+dumps: Callable[[Any], str]
+dumps_pretty: Callable[[Any], str]
+dumpb: Callable[[Any], bytes]
+
+def use(backend: str = "auto") -> str:
+    """
+    Make `backend` ("auto" for the fastest installed) the one behind
+    loads / dumps / dumps_pretty / dumpb, for every module of this process,
+    and return its name. All backends decode to the same objects and write
+    UTF-8 JSON (no \\u escapes); invalid input raises ValueError. A backend
+    that is not installed falls back to "auto" with a warning.
+
+    Call sites use `json_backend.loads(...)` rather than importing the
+    functions, so a later use() takes effect everywhere.
+    """
+    global name, loads, dumps, dumps_pretty, dumpb
+    if backend not in ("auto",) + BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{backend}'. Expected auto or one of: {', '.join(BACKENDS)}")
+    if backend != "auto" and _FACTORIES[backend][0]() is None:
+        logger.warning("JSON backend %s is not installed; using the fastest available one", backend)
+        backend = "auto"
+    if backend == "auto":
+        backend = available()[0]
+    funcs = _FACTORIES[backend][1]()
+    name = backend
+    loads, dumps, dumps_pretty, dumpb = funcs["loads"], funcs["dumps"], funcs["dumps_pretty"], funcs["dumpb"]
+    return name
+
+use()
@@ -0,0 +1,164 @@
+import json
+import re
+from typing import Any, Iterator, Tuple
+
+from . import json_backend
+
+# Well-known assignments of page state in Loom's (and most SSR apps') inline
+# scripts: window.__APOLLO_STATE__ = {...}, __NEXT_DATA__ = {...}, etc. Only
+# the end of a match is used, so any "window." prefix is left out: a pattern
+# starting with a literal lets the regex engine skip ahead instead of trying
+# every position (the optional prefix made this scan cost more than the
+# decode it leads to).
+_STATE_MARKER_RE = re.compile(r"__[A-Z][A-Z0-9_]*__\s*=\s*(?=\{)")
+# Next.js ships its state as a pure JSON script body.
+_LEADING_OBJECT_RE = re.compile(r"\s*(?=\{)")
+# Characters that matter for object boundaries; everything else is skipped
+# by the regex engine rather than by a Python loop.
+_STRUCT_RE = re.compile(r"[{}\"']")
+# JSON/JS string literals cannot span raw newlines.
+_STRING_RES = {
+    '"': re.compile(r'"(?:[^"\\\n]|\\.)*"'),
+    "'": re.compile(r"'(?:[^'\\\n]|\\.)*'"),
+}
+_SINGLE_QUOTE_RE = re.compile(r"(?<!\\)'")
+# Cheap test for "could be a JSON object" ({"key" or {}) before paying for a
+# decode attempt; JS blocks and object literals with bare keys fail it.
+_JSON_START_RE = re.compile(r"\{\s*[\"}]")
+_JS_QUOTED_START_RE = re.compile(r"\{\s*'")
+
+_decoder = json.JSONDecoder()
+
+def _skip_string(s: str, i: int) -> int:
+    """Index just past the string literal opening at s[i], or i + 1 if unterminated."""
+    m = _STRING_RES[s[i]].match(s, i)
+    return m.end() if m else i + 1
+
+def object_end(s: str, start: int) -> int:
+    """
+    Index just past the object literal whose "{" is at s[start], honouring
+    quoted strings and escapes; -1 if it never closes.
+    """
+    depth = 0
+    pos = start
+    while True:
+        m = _STRUCT_RE.search(s, pos)
+        if m is None:
+            return -1
+        ch = m.group()
+        i = m.start()
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        else:
+            pos = _skip_string(s, i)
+            continue
+        pos = i + 1
+
+def iter_object_spans(s: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) of each top-level {...} in a script body. Braces
+    inside string literals do not count.
+    """
+    pos = 0
+    while True:
+        m = _STRUCT_RE.search(s, pos)
+        if m is None:
+            return
+        i = m.start()
+        ch = m.group()
+        if ch == "{":
+            end = object_end(s, i)
+            if end < 0:
+                return
+            yield i, end
+            pos = end
+        elif ch == "}":
+            pos = i + 1
+        else:
+            pos = _skip_string(s, i)
+
+def _decode_at(s: str, start: int) -> Tuple[Any, int]:
+    """raw_decode at `start`; returns (value, end) or (None, -1)."""
+    try:
+        return _decoder.raw_decode(s, start)
+    except ValueError:
+        return None, -1
+
+def _decode_whole(s: str, start: int) -> Tuple[Any, int]:
+    """
+    Like _decode_at, for a value expected to run to the end of `s`: the
+    JSON backend decodes s[start:] whole (it cannot stop after a value, so
+    it only helps when the extent is known), else raw_decode takes over.
+    """
+    if json_backend.name != "json":
+        end = len(s)
+        while end and s[end - 1].isspace():
+            end -= 1
+        if end and s[end - 1] == "}":
+            try:
+                return json_backend.loads(s[start:end]), end
+            except ValueError:
+                pass
+    return _decode_at(s, start)
+
+def iter_json_values(s: str) -> Iterator[Any]:
+    """
+    Yield JSON values embedded in a script body, most likely first.
+
+    Known state assignments are decoded in place with raw_decode, and a
+    body that is itself a JSON object is decoded whole. Then every other
+    top-level object that looks like JSON is decoded in place once; objects
+    written with single quotes get one attempt with the quotes coerced.
+    Other JS blocks are skipped by the string-aware scanner without any
+    decode attempt (a failed decode is not free: JSONDecodeError counts
+    lines from the string start). In-place decodes use the stdlib scanner,
+    the only one that can stop after a value; whole bodies and coerced
+    objects go through json_backend.
+    """
+    decoded = {}  # start -> end of values already yielded
+    for m in _STATE_MARKER_RE.finditer(s):
+        start = m.end()
+        value, end = _decode_at(s, start)
+        if end >= 0:
+            decoded[start] = end
+            yield value
+    lead = _LEADING_OBJECT_RE.match(s)
+    if lead and lead.end() not in decoded and _JSON_START_RE.match(s, lead.end()):
+        value, end = _decode_whole(s, lead.end())
+        if end >= 0:
+            decoded[lead.end()] = end
+            yield value
+
+    pos = 0
+    while True:
+        m = _STRUCT_RE.search(s, pos)
+        if m is None:
+            return
+        i = m.start()
+        ch = m.group()
+        if ch == "{":
+            if i in decoded:
+                pos = decoded[i]
+                continue
+            if _JSON_START_RE.match(s, i):
+                value, end = _decode_at(s, i)
+                if end >= 0:
+                    yield value
+                    pos = end
+                    continue
+            end = object_end(s, i)
+            if end < 0:
+                return
+            if _JS_QUOTED_START_RE.match(s, i):
+                value, ok = _decode_whole(_SINGLE_QUOTE_RE.sub('"', s[i:end]), 0)
+                if ok >= 0:
+                    yield value
+            pos = end
+        elif ch == "}":
+            pos = i + 1
+        else:
+            pos = _skip_string(s, i)
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, List, Optional, Tuple, Union
+
+from .captions import Captions, caption_segment
+
+logger = logging.getLogger(__name__)
+
+# Keys whose values are checked before any other child of a dict.
+_TRANSCRIPT_KEYS = ("transcript", "captions", "subtitles", "srt", "vtt", "text")
+_CAPTION_TEXT_KEYS = ("text", "caption")
+_CAPTION_TIME_KEYS = frozenset(
+    ("start", "end", "startTime", "endTime", "start_time", "end_time", "startMs", "ts", "time", "offset", "begin")
+)
+
+class WalkCost:
+    """Cost of one traversal: nodes popped, string characters read, wall time."""
+
+    __slots__ = ("nodes", "chars", "seconds", "early_exit", "exhausted")
+
+    def __init__(self) -> None:
+        self.nodes = 0
+        self.chars = 0
+        self.seconds = 0.0
+        self.early_exit = False  # stopped at a transcript-shaped captions list
+        self.exhausted = False  # stopped by the node or character budget
+
+class JsonWalker:
+    """
+    Breadth-first search of decoded page state for transcript text.
+
+    A list of caption objects carrying both text and a timestamp ends the
+    walk at once and yields just those captions, timing included. Otherwise
+    strings under the usual transcript keys and scalar list items are
+    collected, as the original heuristic did, with every container visited
+    once. The walk stops after `max_nodes` containers or `max_chars`
+    characters (not encoded bytes) of string data, whichever comes first;
+    totals are kept for the run summary and each walk is logged at DEBUG
+    level.
+    """
+
+    def __init__(self, max_nodes: int = 100_000, max_chars: int = 16_000_000):
+        self.max_nodes = max(1, int(max_nodes))
+        self.max_chars = max(1, int(max_chars))
+        self.walks = 0
+        self.nodes = 0
+        self.chars = 0
+        self.seconds = 0.0
+        self.early_exits = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def walk(self, data: Any) -> Tuple[Optional[Union[str, Captions]], WalkCost]:
+        cost = WalkCost()
+        t0 = time.perf_counter()
+        text = self._walk(data, cost)
+        cost.seconds = time.perf_counter() - t0
+        self._account(cost)
+        return text, cost
+
+    def _walk(self, data: Any, cost: WalkCost) -> Optional[Union[str, Captions]]:
+        queue = deque((data,))
+        queued = {id(data)}
+        fragments: List[str] = []
+
+        def push(v: Any) -> None:
+            if isinstance(v, (dict, list)) and id(v) not in queued:
+                queued.add(id(v))
+                queue.append(v)
+
+        while queue:
+            if cost.nodes >= self.max_nodes or cost.chars >= self.max_chars:
+                cost.exhausted = True
+                break
+            node = queue.popleft()
+            cost.nodes += 1
+            if isinstance(node, dict):
+                # Obvious keys first
+                for key in _TRANSCRIPT_KEYS:
+                    if key in node:
+                        val = node[key]
+                        if isinstance(val, str):
+                            cost.chars += len(val)
+                            if len(val) > 20:
+                                fragments.append(val)
+                        else:
+                            push(val)
+                for v in node.values():
+                    push(v)
+            elif isinstance(node, list):
+                captions = self._caption_text(node, cost)
+                if captions:
+                    cost.early_exit = True
+                    return captions
+                for v in node:
+                    if isinstance(v, (str, int, float)):
+                        s = str(v)
+                        cost.chars += len(s)
+                        if s.strip():
+                            fragments.append(s)
+                    else:
+                        push(v)
+
+        joined = "\n".join(fragments).strip()
+        return joined if len(joined) > 40 else None
+
+    @staticmethod
+    def _caption_text(items: list, cost: WalkCost) -> Optional[Captions]:
+        """Captions of a [{"text": ..., "start": ...}, ...] list, or None for any other list."""
+        first = items[0] if items else None
+        if not isinstance(first, dict) or _CAPTION_TIME_KEYS.isdisjoint(first):
+            return None
+        if not any(isinstance(first.get(k), str) for k in _CAPTION_TEXT_KEYS):
+            return None
+        segments = []
+        for c in items:
+            if isinstance(c, dict):
+                seg = caption_segment(c)
+                if seg is not None:
+                    cost.chars += len(seg[2])
+                    segments.append(seg)
+        captions = Captions.from_segments(segments)
+        return captions if len(captions.text) > 40 else None
+
+    def _account(self, cost: WalkCost) -> None:
+        with self._lock:
+            self.walks += 1
+            self.nodes += cost.nodes
+            self.chars += cost.chars
+            self.seconds += cost.seconds
+            self.early_exits += cost.early_exit
+            self.exhausted += cost.exhausted
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "json walk: %d nodes, %d chars, %.2f ms%s%s",
+                cost.nodes,
+                cost.chars,
+                cost.seconds * 1e3,
+                ", captions found" if cost.early_exit else "",
+                ", budget exhausted" if cost.exhausted else "",
+            )
+
+    def totals(self) -> Tuple[int, int, int, float, int, int]:
+        with self._lock:
+            return self.walks, self.nodes, self.chars, self.seconds, self.early_exits, self.exhausted
+
+    def add_totals(self, totals: Tuple[int, int, int, float, int, int]) -> None:
+        """Fold in totals of walks done elsewhere (e.g. in a parse worker process)."""
+        walks, nodes, chars, seconds, early_exits, exhausted = totals
+        with self._lock:
+            self.walks += walks
+            self.nodes += nodes
+            self.chars += chars
+            self.seconds += seconds
+            self.early_exits += early_exits
+            self.exhausted += exhausted
+
+    def summary(self) -> str:
+        return (
+            f"{self.walks} walks, {self.nodes} nodes, {self.chars} chars, "
+            f"{self.seconds * 1e3:.1f} ms, {self.early_exits} caption hits, {self.exhausted} over budget"
+        )
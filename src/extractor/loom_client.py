@@ -1,89 +1,224 @@
-import json
+import codecs
+import logging
 import os
 import re
-from typing import Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import urllib3
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from .captions import NO_TIME, Captions, Transcript, as_captions, caption_segment
+from .html_scan import ScriptScanner, find_transcript_text_node, iter_transcript_scripts
+from .http_pool import ConnectionStats, PooledAdapter, TransferStats, accept_encoding
+from . import json_backend
+from .json_scan import iter_json_values, iter_object_spans
+from .json_walk import JsonWalker
+from .rate_limit import RateLimiter
+from .strategy_stats import StrategyStats
+
+LOOM_BASE_URL = "https://www.loom.com"
+
+logger = logging.getLogger(__name__)
 
 class LoomError(RuntimeError):
     pass
 
-class LoomClient:
+class _NoVerdict(Exception):
+    """
+    A strategy could not tell whether the video has a transcript there
+    (network failure, error status): move on, but record no outcome.
     """
-    Lightweight Loom client that tries multiple strategies to obtain a transcript:
 
-    1) Known/observed caption endpoints (if available).
-    2) Parse the share page HTML for embedded JSON with transcript/captions.
-    3) Parse player config JSON within inline <script> tags.
+def _last_outcome(retry_state):
+    # Retries exhausted: hand back the final response (or raise the final
+    # exception) so callers treat it like any other answer.
+    return retry_state.outcome.result()
 
-    This client requires public accessibility of the target Loom recording.
+class RetryPolicy:
     """
+    Retry budget applied to each individual HTTP request.
 
-    def __init__(self, user_agent: str, timeout_seconds: int = 20, proxy: Optional[str] = None):
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": user_agent or "LoomTranscriptScraper/1.0",
-                "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
-            }
-        )
-        self.timeout = timeout_seconds
-        self.proxies = {"http": proxy, "https": proxy} if proxy else None
-        self._bearer = os.getenv("LOOM_TOKEN")
+    Connection errors, timeouts and responses with a status in
+    `retry_statuses` are retried up to `max_retries` times with exponential
+    backoff (`backoff_base` * 2^n seconds, capped at `backoff_max`). Any other
+    status, including 401/403/404, is returned to the caller immediately.
+    """
 
-        if self._bearer:
-            self.session.headers["Authorization"] = f"Bearer {self._bearer}"
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.8,
+        backoff_max: float = 6.0,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+    ):
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = float(backoff_base)
+        self.backoff_max = float(backoff_max)
+        self.retry_statuses = frozenset(int(s) for s in retry_statuses)
 
-    @retry(
-        reraise=True,
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=0.8, min=1, max=6),
-        retry=retry_if_exception_type((requests.RequestException, LoomError)),
-    )
-    def fetch_transcript_text(self, video_id: str) -> str:
+    def _kwargs(self, exc_types: Tuple[type, ...], status_of) -> dict:
+        return {
+            "stop": stop_after_attempt(self.max_retries + 1),
+            "wait": wait_exponential(multiplier=self.backoff_base, max=self.backoff_max),
+            "retry": (
+                retry_if_exception_type(exc_types)
+                | retry_if_result(lambda resp: status_of(resp) in self.retry_statuses)
+            ),
+            "retry_error_callback": _last_outcome,
+        }
+
+    def retrying(self, exc_types: Tuple[type, ...], status_of) -> Retrying:
+        return Retrying(**self._kwargs(exc_types, status_of))
+
+    def async_retrying(self, exc_types: Tuple[type, ...], status_of) -> AsyncRetrying:
+        return AsyncRetrying(**self._kwargs(exc_types, status_of))
+
+class _PageReader:
+    """
+    Decodes a page body as it arrives and hands its transcript scripts over
+    as soon as they are complete; stops accepting bytes past `max_bytes`.
+    """
+
+    def __init__(self, encoding: str, max_bytes: int):
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.scanner = ScriptScanner()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.truncated = False
+
+    def feed(self, chunk: bytes) -> List[str]:
+        room = self.max_bytes - self.size
+        if len(chunk) > room:
+            chunk = chunk[:max(0, room)]
+            self.truncated = True
+        self.size += len(chunk)
+        return self.scanner.feed(self._decoder.decode(chunk))
+
+    def finish(self) -> List[str]:
+        return self.scanner.feed(self._decoder.decode(b"", final=True))
+
+    def fallback(self, url: str) -> Optional[str]:
+        if self.truncated:
+            logger.warning("Stopped reading %s after %d bytes (max page size)", url, self.size)
+        return find_transcript_text_node(self.scanner.html)
+
+class _LoomBase:
+    """
+    Transport-independent pieces shared by the sync and async clients:
+    candidate URLs for each strategy and the parsing heuristics.
+    """
+
+    base_url = LOOM_BASE_URL
+    strategy_stats: Optional[StrategyStats] = None
+    retry_policy: RetryPolicy = RetryPolicy()
+    # Anything with get_page/put_page (see cache.TranscriptCache); enables
+    # conditional requests for share and embed pages.
+    page_cache: Any = None
+    # Node/byte budgets for walking decoded page state; also keeps totals.
+    json_walker: JsonWalker = JsonWalker()
+    # Anything with parse_page/aparse_page (see pipeline.offload.ParsePool);
+    # moves page parsing off the I/O workers.
+    page_parser: Any = None
+    # Shared pacing of request attempts across all workers and engines.
+    rate_limiter: Optional[RateLimiter] = None
+    transfer_stats: Optional[TransferStats] = None
+    # Read pages incrementally and stop at the first transcript found;
+    # never read more than max_page_bytes of one page.
+    stream_pages: bool = True
+    max_page_bytes: int = 16 * 1024 * 1024
+    PAGE_CHUNK = 64 * 1024
+
+    # (name, kind, path template) in default order. "api" strategies probe a
+    # JSON endpoint; "page" strategies scrape HTML.
+    STRATEGIES: List[Tuple[str, str, str]] = [
+        ("api_v1_captions", "api", "/api/v1/captions/{id}"),  # legacy guess
+        ("api_captions_transcript", "api", "/api/captions/transcript/{id}"),  # newer guess
+        ("api_v1_videos_transcript", "api", "/api/v1/videos/{id}/transcript"),
+        ("share_page", "page", "/share/{id}"),
+        ("embed_page", "page", "/embed/{id}"),
+    ]
+
+    def _strategies(self, video_id: str) -> List[Tuple[str, str, str]]:
         """
-        Try multiple strategies and return raw transcript text (may contain timestamps/labels).
-        Raises LoomError if nothing workable is found.
+        Strategies to try for this video as (name, kind, url), ordered by
+        strategy_stats when one is attached. Dead strategies come last rather
+        than not at all, so the ordering changes how fast a transcript is
+        found, not whether it is; the exception is an unavailable page
+        (401/403/404), which fails the video before later strategies run.
         """
-        # Strategy 1: Caption/Transcript API candidates
-        apis = [
-            f"https://www.loom.com/api/v1/captions/{video_id}",  # legacy guess
-            f"https://www.loom.com/api/captions/transcript/{video_id}",  # newer guess
-            f"https://www.loom.com/api/v1/videos/{video_id}/transcript",
+        by_name = {name: (kind, path) for name, kind, path in self.STRATEGIES}
+        names = [name for name, _, _ in self.STRATEGIES]
+        if self.strategy_stats is not None:
+            names = self.strategy_stats.order(names)
+        return [
+            (name, by_name[name][0], self.base_url + by_name[name][1].format(id=video_id))
+            for name in names
         ]
-        for url in apis:
-            text = self._try_fetch_json_transcript(url)
-            if text:
-                return text
-
-        # Strategy 2: Scrape share page for embedded transcript
-        share_url = f"https://www.loom.com/share/{video_id}"
-        html = self._get(share_url)
-        text = self._parse_share_page_for_transcript(html)
-        if text:
-            return text
-
-        # Strategy 3: Player page variations
-        player = f"https://www.loom.com/embed/{video_id}"
-        html = self._get(player)
-        text = self._parse_share_page_for_transcript(html)
-        if text:
-            return text
 
-        raise LoomError("Transcript not found or video is private/unavailable.")
+    def _record(self, name: str, hit: bool) -> None:
+        if self.strategy_stats is not None:
+            self.strategy_stats.record(name, hit)
 
-    def _try_fetch_json_transcript(self, url: str) -> Optional[str]:
-        try:
-            resp = self.session.get(url, timeout=self.timeout, proxies=self.proxies)
-            if resp.status_code == 404:
-                return None
-            resp.raise_for_status()
-            data = resp.json()
-        except (requests.RequestException, ValueError):
-            return None
+    def _cached_page(self, url: str) -> Tuple[Optional[tuple], Dict[str, str]]:
+        """
+        Look up stored validators for `url`; returns (entry, request headers).
+        """
+        entry = self.page_cache.get_page(url) if self.page_cache is not None else None
+        headers = {}
+        if entry is not None:
+            etag, last_modified = entry[0], entry[1]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return entry, headers
+
+    @staticmethod
+    def _check_throttled(status: int) -> None:
+        # Still rate limited after every retry: fail the video rather than
+        # reading it as "no transcript at this endpoint".
+        if status == 429:
+            raise LoomError("Rate limited: 429")
+
+    @staticmethod
+    def _status_error(status: int, reason: Any, url: Any) -> LoomError:
+        # Same wording as requests' raise_for_status so error reports do not
+        # depend on the transport.
+        kind = "Client" if status < 500 else "Server"
+        return LoomError(f"{status} {kind} Error: {reason} for url: {url}")
+
+    def _remember_page(self, url: str, resp_headers: Any, text: Optional[Transcript]) -> None:
+        if self.page_cache is None:
+            return
+        etag = resp_headers.get("ETag")
+        last_modified = resp_headers.get("Last-Modified")
+        if etag or last_modified:
+            if isinstance(text, Captions):
+                self.page_cache.put_page(url, etag, last_modified, text.buffer, text.pack())
+            else:
+                self.page_cache.put_page(url, etag, last_modified, text)
 
+    @staticmethod
+    def _stored_page_result(entry: tuple) -> Optional[Transcript]:
+        # (etag, last_modified, result, segments) from get_page
+        result, segments = entry[2], entry[3]
+        if result is not None and segments is not None:
+            return Captions.unpack(result, segments)
+        return result
+
+    def _transcript_from_api_payload(self, data: Any) -> Optional[Transcript]:
         # Heuristics across potential shapes
         if isinstance(data, dict):
             # Common shapes: {"transcript": "..."} or {"captions":[{"text": "..."}]}
@@ -91,12 +226,14 @@ class LoomClient:
                 return data["transcript"]
 
             if "captions" in data and isinstance(data["captions"], list):
-                fragments = []
+                # Keep the caption timing; text is joined only on demand
+                segments = []
                 for c in data["captions"]:
-                    txt = c.get("text") or c.get("caption") or ""
-                    if txt:
-                        fragments.append(txt)
-                return "\n".join(fragments).strip() if fragments else None
+                    seg = caption_segment(c) if isinstance(c, dict) else None
+                    if seg is not None:
+                        segments.append(seg)
+                captions = Captions.from_segments(segments)
+                return captions if captions else None
 
             # Some APIs nest under 'data'
             if "data" in data:
@@ -106,110 +243,294 @@ class LoomClient:
 
         if isinstance(data, list):
             # Perhaps list of caption fragments
-            fragments = []
+            segments = []
             for c in data:
                 if isinstance(c, dict):
-                    txt = c.get("text") or c.get("caption") or ""
+                    seg = caption_segment(c)
                 else:
-                    txt = str(c)
-                if txt:
-                    fragments.append(txt)
-            return "\n".join(fragments).strip() if fragments else None
+                    seg = (NO_TIME, NO_TIME, str(c)) if str(c) else None
+                if seg is not None:
+                    segments.append(seg)
+            captions = Captions.from_segments(segments)
+            return captions if captions else None
 
         return None
 
-    def _parse_share_page_for_transcript(self, html: str) -> Optional[str]:
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Look for <script> containing "transcript"
-        candidates = soup.find_all("script")
-        for script in candidates:
-            content = script.string or script.text or ""
-            if not content or "transcript" not in content.lower():
-                continue
-
-            # Try to extract JSON blocks in the script
-            for blob in self._extract_json_like_strings(content):
-                txt = self._extract_text_from_json_blob(blob)
-                if txt:
-                    return txt
+    def _parse_share_page_for_transcript(self, html: str) -> Optional[Transcript]:
+        # Look for <script> containing "transcript"; scripts are located by
+        # scanning the markup rather than building a full DOM.
+        for content in iter_transcript_scripts(html):
+            txt = self._parse_script_for_transcript(content)
+            if txt:
+                return txt
 
         # Search for elements possibly holding text tracks
         # (fallback heuristics)
-        text_nodes = soup.find_all(text=re.compile(r"\btranscript\b", re.IGNORECASE))
-        for node in text_nodes:
-            s = str(node)
-            if len(s) > 40:
-                return s
+        return find_transcript_text_node(html)
 
+    def _parse_script_for_transcript(self, content: str) -> Optional[Transcript]:
+        # Try the JSON values embedded in the script, state blobs first
+        for data in iter_json_values(content):
+            txt = self._extract_text_from_json_data(data)
+            if txt:
+                return txt
         return None
 
     def _extract_json_like_strings(self, s: str):
-        # Greedy braces extraction; tries to parse big JSON-ish structures
-        stack = []
-        start = None
-        for i, ch in enumerate(s):
-            if ch == "{":
-                if not stack:
-                    start = i
-                stack.append("{")
-            elif ch == "}":
-                if stack:
-                    stack.pop()
-                    if not stack and start is not None:
-                        yield s[start : i + 1]
-
-    def _extract_text_from_json_blob(self, blob: str) -> Optional[str]:
+        # Top-level {...} spans; braces inside string literals are ignored
+        for start, end in iter_object_spans(s):
+            yield s[start:end]
+
+    def _extract_text_from_json_blob(self, blob: str) -> Optional[Transcript]:
         try:
-            data = json.loads(blob)
+            data = json_backend.loads(blob)
         except Exception:
             # Some blobs may be JS, try to coerce quotes
             coerced = re.sub(r"(?<!\\)'", '"', blob)
             try:
-                data = json.loads(coerced)
+                data = json_backend.loads(coerced)
             except Exception:
                 return None
+        return self._extract_text_from_json_data(data)
 
-        # Heuristic walk to find transcript-like content
-        queue = [data]
-        fragments = []
-        seen = 0
-        while queue and seen < 20000:
-            seen += 1
-            node = queue.pop(0)
-            if isinstance(node, dict):
-                # Obvious keys first
-                for key in ("transcript", "captions", "subtitles", "srt", "vtt", "text"):
-                    if key in node:
-                        val = node[key]
-                        if isinstance(val, str) and len(val) > 20:
-                            fragments.append(val)
-                        elif isinstance(val, list):
-                            for item in val:
-                                if isinstance(item, (str, int, float)) and str(item).strip():
-                                    fragments.append(str(item))
-                                else:
-                                    queue.append(item)
-                        elif isinstance(val, dict):
-                            queue.append(val)
-                # Enqueue children
-                for v in node.values():
-                    if isinstance(v, (dict, list)):
-                        queue.append(v)
-            elif isinstance(node, list):
-                for v in node:
-                    if isinstance(v, (dict, list)):
-                        queue.append(v)
-                    elif isinstance(v, (str, int, float)) and str(v).strip():
-                        fragments.append(str(v))
-
-        joined = "\n".join(fragments).strip()
-        return joined if len(joined) > 40 else None
+    def _extract_text_from_json_data(self, data: Any) -> Optional[Transcript]:
+        # Heuristic walk to find transcript-like content (see json_walk)
+        text, _ = self.json_walker.walk(data)
+        return text
 
-    def _get(self, url: str) -> str:
-        resp = self.session.get(url, timeout=self.timeout, proxies=self.proxies)
-        # 4xx from private videos should bubble up to retries/handler
+class LoomClient(_LoomBase):
+    """
+    Lightweight Loom client that tries multiple strategies to obtain a transcript:
+
+    1) Known/observed caption endpoints (if available).
+    2) Parse the share page HTML for embedded JSON with transcript/captions.
+    3) Parse player config JSON within inline <script> tags.
+
+    This client requires public accessibility of the target Loom recording.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        timeout_seconds: int = 20,
+        proxy: Optional[str] = None,
+        base_url: str = LOOM_BASE_URL,
+        strategy_stats: Optional[StrategyStats] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        page_cache: Any = None,
+        json_walker: Optional[JsonWalker] = None,
+        page_parser: Any = None,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        connection_stats: Optional[ConnectionStats] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        stream_pages: bool = True,
+        max_page_bytes: int = 16 * 1024 * 1024,
+        compression: bool = False,
+        transfer_stats: Optional[TransferStats] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.strategy_stats = strategy_stats
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.page_cache = page_cache
+        self.json_walker = json_walker or JsonWalker()
+        self.page_parser = page_parser
+        self.rate_limiter = rate_limiter
+        self.stream_pages = stream_pages
+        self.max_page_bytes = max(1, int(max_page_bytes))
+        self.transfer_stats = transfer_stats
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "User-Agent": user_agent or "LoomTranscriptScraper/1.0",
+                "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+                # br/zstd only when opted in and urllib3 can decode them.
+                "Accept-Encoding": accept_encoding(
+                    urllib3.response.HTTPResponse.CONTENT_DECODERS, compression
+                ),
+            }
+        )
+        # One pooled connection per worker thread (pool_maxsize) so that
+        # connections are kept alive instead of discarded on return.
+        self.connection_stats = connection_stats
+        adapter = PooledAdapter(pool_maxsize, pool_block, connection_stats)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        self.timeout = timeout_seconds
+        self.proxies = {"http": proxy, "https": proxy} if proxy else None
+        self._bearer = os.getenv("LOOM_TOKEN")
+
+        if self._bearer:
+            self.session.headers["Authorization"] = f"Bearer {self._bearer}"
+
+    def close(self) -> None:
+        self.session.close()
+
+    def fetch_transcript_text(self, video_id: str) -> str:
+        """
+        Try multiple strategies and return raw transcript text (may contain timestamps/labels).
+        Raises LoomError if nothing workable is found.
+        """
+        return self.fetch_transcript(video_id).text
+
+    def fetch_transcript(self, video_id: str) -> Captions:
+        """
+        Like fetch_transcript_text, but as Captions: timed segments when the
+        source carried caption timing, else the text as one untimed segment.
+        """
+        return self.fetch(video_id)[1]
+
+    def fetch(self, video_id: str) -> Tuple[str, Captions]:
+        """
+        (name of the strategy that found it, Captions); see fetch_transcript.
+        """
+        # Caption/Transcript API candidates first, then the share and player
+        # pages (see STRATEGIES); strategy_stats may reorder them. Only a
+        # strategy that ran to the end counts as a hit or miss: errors say
+        # nothing about the strategy (a private video fails every one).
+        for name, kind, url in self._strategies(video_id):
+            try:
+                if kind == "api":
+                    text = self._try_fetch_json_transcript(url)
+                else:
+                    text = self._fetch_page_transcript(url)
+            except _NoVerdict:
+                continue
+            self._record(name, bool(text))
+            if text:
+                return name, as_captions(text)
+
+        raise LoomError("Transcript not found or video is private/unavailable.")
+
+    def _request(
+        self, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False
+    ) -> requests.Response:
+        """
+        GET with the client's retry policy applied to this request alone.
+        With `stream`, the body of a 2xx response is left unread.
+        """
+        retrying = self.retry_policy.retrying(
+            (requests.ConnectionError, requests.Timeout), lambda resp: resp.status_code
+        )
+        return retrying(self._send, url, headers, stream)
+
+    def _send(self, url: str, headers: Optional[Dict[str, str]], stream: bool = False) -> requests.Response:
+        # One attempt; the rate limiter paces attempts, retries included.
+        host = urlsplit(url).netloc
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(host)
+        resp = self.session.get(url, headers=headers, timeout=self.timeout, proxies=self.proxies, stream=stream)
+        if not stream or resp.status_code >= 300:
+            # Read (short) error bodies now so the connection goes back to the pool.
+            self._record_transfer(resp, len(resp.content))
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(host, resp.status_code, resp.headers.get("Retry-After"))
+        return resp
+
+    def _try_fetch_json_transcript(self, url: str) -> Optional[Transcript]:
+        # None when the endpoint answered without a transcript (a 404 here
+        # means the guessed endpoint does not exist); _NoVerdict otherwise.
+        try:
+            resp = self._request(url)
+        except requests.RequestException as e:
+            raise _NoVerdict(str(e)) from e
+        if resp.status_code == 404:
+            return None
+        self._check_throttled(resp.status_code)
+        if resp.status_code >= 400:
+            raise _NoVerdict(f"{resp.status_code} from {url}")
+        try:
+            data = json_backend.loads(resp.content)
+        except ValueError:
+            return None
+
+        return self._transcript_from_api_payload(data)
+
+    def _fetch_page_transcript(self, url: str) -> Optional[Transcript]:
+        """
+        Download and parse a share/embed page. With a page cache attached the
+        request is conditional, and a 304 reuses the stored parse result.
+        """
+        entry, headers = self._cached_page(url)
+        resp = self._request(url, headers, stream=self.stream_pages)
+        reader = None
+        try:
+            if resp.status_code == 304 and entry is not None:
+                return self._stored_page_result(entry)
+            if self.stream_pages:
+                self._check_status(resp)
+                reader = _PageReader(self._body_encoding(resp), self.max_page_bytes)
+                text = self._read_page_stream(url, reader, self._iter_body(resp))
+            else:
+                html = self._check_page(resp)
+                if self.page_parser is not None:
+                    text = self.page_parser.parse_page(html)
+                else:
+                    text = self._parse_share_page_for_transcript(html)
+        finally:
+            # Closing a partly read stream drops its connection.
+            self._release(resp)
+            if reader is not None:
+                self._record_transfer(resp, reader.size)
+        self._remember_page(url, resp.headers, text)
+        return text
+
+    def _read_page_stream(self, url: str, reader: _PageReader, chunks: Iterable[bytes]) -> Optional[Transcript]:
+        """
+        Parse each transcript script as soon as it has fully arrived and stop
+        reading at the first one that yields a transcript. The text-node
+        fallback runs on the whole page (or its first max_page_bytes).
+        """
+        for chunk in chunks:
+            for content in reader.feed(chunk):
+                txt = self._parse_script(content)
+                if txt:
+                    return txt
+            if reader.truncated:
+                break
+        else:
+            for content in reader.finish():
+                txt = self._parse_script(content)
+                if txt:
+                    return txt
+        return reader.fallback(url)
+
+    def _parse_script(self, content: str) -> Optional[Transcript]:
+        if self.page_parser is not None:
+            return self.page_parser.parse_script(content)
+        return self._parse_script_for_transcript(content)
+
+    def _iter_body(self, resp: requests.Response) -> Iterable[bytes]:
+        return resp.iter_content(self.PAGE_CHUNK)
+
+    def _body_encoding(self, resp: requests.Response) -> str:
+        return resp.encoding or "utf-8"
+
+    def _release(self, resp: requests.Response) -> None:
+        resp.close()
+
+    def _record_transfer(self, resp: requests.Response, decoded: int) -> None:
+        if self.transfer_stats is not None:
+            self.transfer_stats.record(
+                resp.url, resp.headers.get("Content-Encoding"), self._wire_bytes(resp), decoded
+            )
+
+    def _wire_bytes(self, resp: requests.Response) -> int:
+        # Body bytes urllib3 read from the socket, before content decoding
+        return resp.raw.tell()
+
+    def _check_status(self, resp: requests.Response) -> None:
+        # 4xx from private videos are permanent: fail the video without retrying
         if resp.status_code in (401, 403, 404):
             raise LoomError(f"Unavailable: {resp.status_code}")
         resp.raise_for_status()
-        return resp.text
\ No newline at end of file
+
+    def _check_page(self, resp: requests.Response) -> str:
+        self._check_status(resp)
+        return resp.text
+
+    def _get(self, url: str) -> str:
+        return self._check_page(self._request(url))
\ No newline at end of file
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Longest Retry-After honoured; anything beyond is treated as this.
+_MAX_RETRY_AFTER = 600.0
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - (now if now is not None else time.time())
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return None
+    return min(max(0.0, seconds), _MAX_RETRY_AFTER)
+
+class _Bucket:
+    """Token bucket that hands out reservations: tokens may go negative."""
+
+    __slots__ = ("rate", "burst", "tokens", "stamp", "blocked_until")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+        self.blocked_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        self.tokens -= 1.0
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+class RateLimiter:
+    """
+    Request pacing shared by every worker of every engine.
+
+    Each host has a token bucket starting at `per_host_rate` requests per
+    second (bursts of up to `burst`), and all hosts together are capped by
+    `global_rate` (None for no cap). Host rates adapt AIMD-style: every
+    successful response adds `increase` req/s (up to the global rate, or
+    `max_rate`), and a 429/503 halves the rate (at most once per
+    `cooldown` seconds, so a burst of rejections counts once; never below
+    `min_rate`). A Retry-After on those responses also holds back the whole
+    host until it expires.
+
+    Callers reserve a slot with acquire()/aacquire() before each request
+    attempt and report its status with feedback().
+    """
+
+    THROTTLE_STATUSES = frozenset((429, 503))
+
+    def __init__(
+        self,
+        per_host_rate: float = 20.0,
+        global_rate: Optional[float] = 100.0,
+        burst: float = 20.0,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.per_host_rate = float(per_host_rate)
+        self.burst = max(1.0, float(burst))
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate or global_rate or float("inf"))
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.cooldown = float(cooldown)
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        self._global = _Bucket(float(global_rate), self.burst, now) if global_rate else None
+        self._hosts: Dict[str, _Bucket] = {}
+        self._last_decrease: Dict[str, float] = {}
+        self.waits = 0
+        self.waited = 0.0
+        self.slowdowns = 0
+
+    def _delay(self, host: str) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._hosts.get(host)
+            if bucket is None:
+                bucket = self._hosts[host] = _Bucket(self.per_host_rate, self.burst, now)
+            wait = bucket.reserve(now)
+            if self._global is not None:
+                wait = max(wait, self._global.reserve(now))
+            if wait > 0:
+                self.waits += 1
+                self.waited += wait
+        return wait
+
+    def acquire(self, host: str) -> None:
+        wait = self._delay(host)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, host: str) -> None:
+        wait = self._delay(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def feedback(self, host: str, status: int, retry_after: Optional[str] = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._hosts.get(host)
+            if bucket is None:
+                return
+            if status in self.THROTTLE_STATUSES:
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    bucket.blocked_until = max(bucket.blocked_until, now + delay)
+                if now - self._last_decrease.get(host, float("-inf")) >= self.cooldown:
+                    self._last_decrease[host] = now
+                    bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                    # Drop saved-up burst so the lower rate applies at once.
+                    bucket.tokens = min(bucket.tokens, 0.0)
+                    self.slowdowns += 1
+            elif status < 400:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def rates(self) -> Dict[str, float]:
+        with self._lock:
+            return {host: b.rate for host, b in self._hosts.items()}
+
+    def summary(self) -> str:
+        rates = ", ".join(f"{host} {rate:.1f}/s" for host, rate in sorted(self.rates().items())) or "no requests"
+        avg = self.waited / self.waits if self.waits else 0.0
+        return f"{self.waits} requests delayed (avg {avg:.2f}s), {self.slowdowns} slowdowns; final rate {rates}"
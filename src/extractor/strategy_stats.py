@@ -0,0 +1,92 @@
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from . import json_backend
+
+class StrategyStats:
+    """
+    Remembers which transcript strategies have been paying off during a run.
+
+    Each strategy keeps its last `window` outcomes. Live strategies are
+    ordered by recent hit rate; ties keep the caller's default order. A
+    strategy with at least `min_samples` recent outcomes and no hit among
+    them is considered dead and goes last, except that every
+    `explore_every`-th lookup puts dead strategies back at their default
+    position, so a recovered endpoint gets the chance to hit again.
+
+    Safe to share between threads and engines.
+    """
+
+    def __init__(self, window: int = 50, min_samples: int = 10, explore_every: int = 50):
+        self.window = max(1, window)
+        self.min_samples = max(1, min_samples)
+        self.explore_every = max(1, explore_every)
+        self._outcomes: Dict[str, Deque[bool]] = {}
+        self._lookups = 0
+        self._lock = threading.Lock()
+
+    def record(self, name: str, hit: bool) -> None:
+        with self._lock:
+            q = self._outcomes.get(name)
+            if q is None:
+                q = self._outcomes[name] = deque(maxlen=self.window)
+            q.append(hit)
+
+    def order(self, names: List[str]) -> List[str]:
+        """
+        Return all of `names`, best first. If every strategy looks dead they
+        keep the caller's order.
+        """
+        with self._lock:
+            self._lookups += 1
+            explore = self._lookups % self.explore_every == 0
+            live, dead = [], []
+            for idx, name in enumerate(names):
+                q = self._outcomes.get(name)
+                if q is None or len(q) < self.min_samples:
+                    # Not enough evidence yet: keep default position.
+                    live.append((-1.0, idx, name))
+                    continue
+                hits = sum(q)
+                if hits:
+                    live.append((-hits / len(q), idx, name))
+                elif explore:
+                    # Probe it where it would be with no evidence.
+                    live.append((-1.0, idx, name))
+                else:
+                    dead.append(name)
+
+        return [name for _, _, name in sorted(live)] + dead
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                name: {"attempts": len(q), "hits": sum(q)}
+                for name, q in self._outcomes.items()
+            }
+
+    def load(self, path: Path) -> None:
+        """Seed outcomes from a previous run's save(); missing/corrupt files are ignored."""
+        try:
+            with Path(path).open("r", encoding="utf-8") as f:
+                data = json_backend.loads(f.read())
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        for name, outcomes in data.items():
+            if isinstance(outcomes, list):
+                for hit in outcomes[-self.window:]:
+                    self.record(str(name), bool(hit))
+
+    def save(self, path: Path) -> None:
+        with self._lock:
+            data = {name: [int(h) for h in q] for name, q in self._outcomes.items()}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write(json_backend.dumps(data))
+        tmp.replace(path)
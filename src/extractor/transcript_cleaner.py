@@ -1,62 +1,178 @@
 import re
-from .utils import is_probably_timestamp, normalize_whitespace
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .captions import Captions
+from .utils import _TIMESTAMP_RE
 
 _SPEAKER_LABEL_RE = re.compile(
     r"^\s*(speaker|host|guest|agent|user|you|presenter)\s*\d*\s*[:\-]\s*",
     re.IGNORECASE,
 )
+# The leading lookahead lets the engine skip positions that cannot start a
+# timestamp instead of trying the optional brackets at every character.
 _TIMESTAMP_INLINE_RE = re.compile(
-    r"(\[?\(?(?:\d{1,2}:)?\d{1,2}:\d{2}(?:,\d{3})?\)?\]?)"
+    r"(?=[\[(\d])(\[?\(?(?:\d{1,2}:)?\d{1,2}:\d{2}(?:,\d{3})?\)?\]?)"
+)
+# Non-speech lines ([music], "Generated by Loom transcript...") in one pattern.
+_METADATA_RE = re.compile(
+    r"\s*(?:\[?(?:music|applause|laughter|silence|background noise)\]?\s*$"
+    r"|generated by.*loom.*transcript.*$)",
+    re.IGNORECASE,
 )
-_METADATA_MARKERS = [
-    re.compile(r"^\s*\[?(music|applause|laughter|silence|background noise)\]?\s*$", re.IGNORECASE),
-    re.compile(r"^\s*generated by.*loom.*transcript.*$", re.IGNORECASE),
-]
+_INNER_SPACE_RE = re.compile(r"\s{2,}")
 
-def _strip_speaker_labels(line: str) -> str:
-    return _SPEAKER_LABEL_RE.sub("", line)
+def _clean_line(line: str) -> Optional[str]:
+    """One line cleaned; "" when it is dropped, None when it is a paragraph break."""
+    if line.endswith("\r"):  # CRLF
+        line = line[:-1]
+    stripped = line.strip()
+    # Blank lines and standalone timestamps separate paragraphs
+    if not stripped or _TIMESTAMP_RE.fullmatch(stripped):
+        return None
+    if ":" in line:
+        line = _TIMESTAMP_INLINE_RE.sub("", line)
+        if not line.strip():
+            return None
 
-def _strip_timestamps(line: str) -> str:
-    # Kill standalone timestamps or inline brackets
-    if is_probably_timestamp(line.strip()):
+    m = _SPEAKER_LABEL_RE.match(line)
+    if m:
+        line = line[m.end():]
+    line = line.strip()
+    if not line or _METADATA_RE.match(line):
         return ""
-    return _TIMESTAMP_INLINE_RE.sub("", line)
 
-def _is_only_metadata(line: str) -> bool:
-    l = line.strip()
-    for rx in _METADATA_MARKERS:
-        if rx.match(l):
-            return True
-    return False
+    # remove extra inner spaces
+    return _INNER_SPACE_RE.sub(" ", line)
 
 def clean_transcript(raw_text: str) -> str:
     """
     Remove timestamps, speaker labels, and non-speech metadata.
     Normalize whitespace and join into readable paragraphs.
+
+    Single pass over the lines: each one is cleaned and appended to the
+    output directly, and blank-line runs collapse to one paragraph break
+    as they are met, so no intermediate copy of the whole text is built.
     """
     if not raw_text:
         return ""
 
-    # Split preserving lines, clean line-by-line
-    cleaned_lines = []
-    for line in raw_text.replace("\r\n", "\n").split("\n"):
-        line = _strip_timestamps(line)
-        if not line.strip():
-            cleaned_lines.append("")  # keep paragraph separation
+    out: List[str] = []
+    pending_break = False  # blank line(s) seen since the last kept line
+    for line in raw_text.split("\n"):
+        line = _clean_line(line)
+        if line is None:
+            pending_break = True
             continue
+        if not line:
+            continue
+        if pending_break and out:
+            out.append("")
+        pending_break = False
+        if "\r" in line:
+            # A lone CR still ends a line (as in universal newlines)
+            out.extend(line.split("\r"))
+        else:
+            out.append(line)
 
-        line = _strip_speaker_labels(line).strip()
+    return "\n".join(out)
 
-        if _is_only_metadata(line) or not line:
-            continue
+def clean_captions(captions: Captions) -> Captions:
+    """
+    clean_transcript applied segment by segment: the result's text is
+    exactly clean_transcript(captions.text), and each segment keeps its
+    timing and spans what remained of its own text. Segments left empty
+    are dropped.
+    """
+    out: List[str] = []
+    starts, ends, lo, hi = array("q"), array("q"), array("q"), array("q")
+    pending_break = False
+    pos = 0  # offset of the next line in "\n".join(out)
+    for start, end, text in captions:
+        first = last = -1
+        for line in text.split("\n"):
+            line = _clean_line(line)
+            if line is None:
+                pending_break = True
+                continue
+            if not line:
+                continue
+            if pending_break and out:
+                out.append("")
+                pos += 1
+            pending_break = False
+            for piece in line.split("\r") if "\r" in line else (line,):
+                out.append(piece)
+                if first < 0:
+                    first = pos
+                pos += len(piece) + 1
+                last = pos - 1
+        if first >= 0:
+            starts.append(start)
+            ends.append(end)
+            lo.append(first)
+            hi.append(last)
+
+    return Captions("\n".join(out), starts, ends, lo, hi)
+
+def _clean_chunk(texts: List[str]) -> List[str]:
+    return [clean_transcript(t) for t in texts]
 
-        # remove extra inner spaces
-        line = re.sub(r"\s{2,}", " ", line)
-        cleaned_lines.append(line)
+def clean_transcripts(
+    texts: Iterable[str],
+    workers: int = 1,
+    chunk_size: int = 256,
+    ordered: bool = True,
+) -> Iterator[Union[str, Tuple[int, str]]]:
+    """
+    Clean many transcripts, `chunk_size` documents per task, across
+    `workers` processes (in this process when workers <= 1).
+
+    `texts` is consumed lazily and at most 2x workers chunks are in flight.
+    With `ordered=True` cleaned texts are yielded in input order; otherwise
+    (index, cleaned) pairs are yielded as soon as their chunk completes.
+    """
+    chunk_size = max(1, chunk_size)
+    it = iter(texts)
+    chunks = iter(lambda: list(islice(it, chunk_size)), [])
 
-    text = "\n".join(cleaned_lines)
-    text = normalize_whitespace(text)
+    if workers <= 1:
+        index = 0
+        for chunk in chunks:
+            for cleaned in _clean_chunk(chunk):
+                yield cleaned if ordered else (index, cleaned)
+                index += 1
+        return
 
-    # Post-process: convert multiple newlines to paragraph spacing
-    text = re.sub(r"\n{2,}", "\n\n", text).strip()
-    return text
\ No newline at end of file
+    window = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}  # future -> (chunk number, index of its first text)
+        done_chunks = {}  # chunk number -> results waiting for their turn
+        submitted = 0
+        next_chunk = 0
+        first = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) + len(done_chunks) < window:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                in_flight[pool.submit(_clean_chunk, chunk)] = (submitted, first)
+                submitted += 1
+                first += len(chunk)
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                number, start = in_flight.pop(fut)
+                results = fut.result()
+                if ordered:
+                    done_chunks[number] = results
+                else:
+                    yield from enumerate(results, start)
+            while next_chunk in done_chunks:
+                yield from done_chunks.pop(next_chunk)
+                next_chunk += 1
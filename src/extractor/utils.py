@@ -6,6 +6,8 @@ _URL_ID_RE = re.compile(
     r"(?:https?://)?(?:www\.)?loom\.com/(?:share|embed|recording)/([a-f0-9]{32})",
     re.IGNORECASE,
 )
+_TIMESTAMP_RE = re.compile(r"(?:\d{1,2}:)?\d{1,2}:\d{2}(?:,\d{1,3})?")
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
 
 def extract_video_id(item: str) -> Optional[str]:
     """
@@ -32,7 +34,7 @@ def is_probably_timestamp(token: str) -> bool:
     """Heuristically determine if a string looks like a timestamp like 00:12 or 01:02:03"""
     if not token:
         return False
-    return bool(re.fullmatch(r"(?:\d{1,2}:)?\d{1,2}:\d{2}(?:,\d{1,3})?", token))
+    return bool(_TIMESTAMP_RE.fullmatch(token))
 
 def normalize_whitespace(text: str) -> str:
     """Collapse repeated whitespace while keeping single newlines."""
@@ -41,5 +43,5 @@ def normalize_whitespace(text: str) -> str:
     # Remove trailing spaces per line
     text = "\n".join(line.strip() for line in text.split("\n"))
     # Collapse consecutive blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _BLANK_RUN_RE.sub("\n\n", text)
     return text.strip()
\ No newline at end of file
@@ -1,15 +1,34 @@
 import argparse
-import json
+import asyncio
+import logging
 import os
+import sqlite3
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from collections import deque
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from extractor.loom_client import LoomClient, LoomError
-from extractor.transcript_cleaner import clean_transcript
+from extractor.cache import TranscriptCache
+from extractor.captions import Captions
+from extractor import json_backend
+from extractor.http_pool import ConnectionStats, TransferStats
+from extractor.json_walk import JsonWalker
+from extractor.loom_client import LOOM_BASE_URL, LoomClient, LoomError, RetryPolicy
+from extractor.rate_limit import RateLimiter
+from extractor.strategy_stats import StrategyStats
+from extractor.transcript_cleaner import clean_captions, clean_transcripts
 from extractor.utils import extract_video_id
-from output.writer import write_json
+from output.journal import Journal
+from output.sqlite import search as search_transcripts
+from output.subtitles import SUBTITLE_FORMATS, SubtitleWriter
+from output.shards import COMPRESSIONS, read_jsonl_lines
+from output.writer import FORMATS, JsonlWriter, open_writer, sidecar_path
+from pipeline.engines import run_async, run_threaded
+from pipeline.inputs import INPUT_FORMATS, iter_input
+from pipeline.offload import ParsePool
+from pipeline.plan import InputPlanner
 
 def load_settings(config_dir: Path) -> Dict[str, Any]:
     # Prefer settings.json if user created it; fall back to example
@@ -18,57 +37,341 @@ def load_settings(config_dir: Path) -> Dict[str, Any]:
     for p in (user_cfg, example_cfg):
         if p.exists():
             with p.open("r", encoding="utf-8") as f:
-                return json.load(f)
+                return json_backend.loads(f.read())
     # Hard defaults
     return {
         "user_agent": "LoomTranscriptScraper/1.0",
         "timeout_seconds": 20,
         "max_retries": 3,
+        "retry_backoff_base": 0.8,
+        "retry_backoff_max": 6,
+        "retry_statuses": [429, 500, 502, 503, 504],
         "concurrent_workers": 4,
+        "engine": "threads",
+        "async_concurrency": 200,
+        "adaptive_strategies": True,
+        "strategy_stats_path": None,
+        "cache_dir": None,
+        "cache_ttl_seconds": 604800,
+        "cache_max_mb": 1024,
         "respect_robots_txt": False,
         "proxy": None,
         "output_pretty": True,
+        "subtitles_dir": None,
+        "subtitle_format": "srt",
+        "output_format": "json",
+        "output_buffer_kb": 256,
+        "output_fsync_seconds": 5,
+        "parquet_row_group_rows": 10000,
+        "parquet_compression": "zstd",
+        "sqlite_batch_rows": 500,
+        "shard_rows": None,
+        "shard_mb": None,
+        "output_compression": None,
+        "json_backend": "auto",
+        "max_in_flight": None,
+        "json_walk_max_nodes": 100000,
+        "json_walk_max_chars": 16000000,
+        "parse_workers": 0,
+        "parse_queue": None,
+        "http_pool_maxsize": None,
+        "http_pool_block": False,
+        "http_keep_alive": True,
+        "http_keepalive_seconds": 15,
+        "http_compression": False,
+        "http_transport": "requests",
+        "rate_limit_per_host": None,
+        "rate_limit_global": 100,
+        "rate_limit_burst": 20,
+        "rate_limit_min": 0.5,
+        "stream_pages": True,
+        "page_max_mb": 16,
     }
 
 def parse_input(input_path: Path) -> List[str]:
     """
     Accept a JSON file with an array of strings (URLs or IDs).
+    Materializes the whole list; main() streams via pipeline.inputs instead.
     """
-    with input_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    return list(iter_input(str(input_path), "json"))
 
-    if isinstance(data, list):
-        return [str(x) for x in data]
-    elif isinstance(data, dict) and "items" in data and isinstance(data["items"], list):
-        return [str(x) for x in data["items"]]
-    else:
-        raise ValueError("Input JSON must be an array of URLs/IDs or an object with 'items' array.")
+def default_cache_dir() -> Path:
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "loom-transcript-scraper"
+
+def _fetch_info(strategy: str, raw: str, t0: float, t1: Optional[float] = None) -> Dict[str, Any]:
+    # Timings in ms from t0 (start) and t1 (fetched; None for cache hits).
+    now = time.perf_counter()
+    t1 = now if t1 is None else t1
+    return {
+        "strategy": strategy,
+        "rawBytes": len(raw.encode("utf-8")),
+        "fetchMs": (t1 - t0) * 1e3,
+        "cleanMs": (now - t1) * 1e3,
+        "fetchedAt": int(time.time() * 1e3),
+    }
+
+def process_one(
+    client: LoomClient,
+    item: str,
+    cache: Optional[TranscriptCache] = None,
+    parse_pool: Optional[ParsePool] = None,
+) -> Tuple[str, Captions, Dict[str, Any]]:
+    """
+    Returns (videoId, cleaned Captions, fetch info) on success; raises on
+    failure. The info holds the strategy that found the transcript ("cache"
+    for a hit), the raw size and fetch/clean times (see _fetch_info).
+    A fresh cache entry short-circuits the network entirely. With a
+    parse_pool, cleaning runs there instead of on the calling thread.
+    """
+    vid = extract_video_id(item)
+    if not vid:
+        raise ValueError(f"Could not extract Loom video ID from '{item}'")
+
+    t0 = time.perf_counter()
+    hit = cache.get(vid) if cache is not None else None
+    if hit is not None:
+        return vid, Captions.unpack(hit[1], hit[2]), _fetch_info("cache", hit[0], t0)
+
+    strategy, raw = client.fetch(vid)
+    t1 = time.perf_counter()
+    cleaned = parse_pool.clean_captions(raw) if parse_pool is not None else clean_captions(raw)
+    if not cleaned:
+        raise LoomError("Transcript extracted but empty after cleaning.")
 
-def process_one(client: LoomClient, item: str) -> Tuple[str, str]:
+    if cache is not None:
+        cache.put(vid, raw.text, cleaned.text, cleaned.pack() if cleaned.timed else None)
+    return vid, cleaned, _fetch_info(strategy, raw.text, t0, t1)
+
+async def process_one_async(
+    client: Any,
+    item: str,
+    cache: Optional[TranscriptCache] = None,
+    parse_pool: Optional[ParsePool] = None,
+) -> Tuple[str, Captions, Dict[str, Any]]:
     """
-    Returns (videoId, cleanedTranscript) on success; raises on failure.
+    Async twin of process_one for AsyncLoomClient.
     """
     vid = extract_video_id(item)
     if not vid:
         raise ValueError(f"Could not extract Loom video ID from '{item}'")
 
-    raw = client.fetch_transcript_text(vid)
-    cleaned = clean_transcript(raw)
+    t0 = time.perf_counter()
+    hit = cache.get(vid) if cache is not None else None
+    if hit is not None:
+        return vid, Captions.unpack(hit[1], hit[2]), _fetch_info("cache", hit[0], t0)
+
+    strategy, raw = await client.fetch(vid)
+    t1 = time.perf_counter()
+    cleaned = await parse_pool.aclean_captions(raw) if parse_pool is not None else clean_captions(raw)
     if not cleaned:
         raise LoomError("Transcript extracted but empty after cleaning.")
 
-    return vid, cleaned
+    if cache is not None:
+        cache.put(vid, raw.text, cleaned.text, cleaned.pack() if cleaned.timed else None)
+    return vid, cleaned, _fetch_info(strategy, raw.text, t0, t1)
+
+def run_async_engine(
+    client_kwargs: Dict[str, Any],
+    items: Iterable[str],
+    concurrency: int,
+    on_result,
+    on_error,
+    cache: Optional[TranscriptCache] = None,
+    parse_pool: Optional[ParsePool] = None,
+) -> None:
+    # Imported lazily so the threaded path does not require aiohttp.
+    from extractor.async_client import AsyncLoomClient
+
+    async def runner() -> None:
+        client = AsyncLoomClient(max_connections=max(1, concurrency), **client_kwargs)
+        try:
+            await run_async(
+                lambda it: process_one_async(client, it, cache, parse_pool),
+                items,
+                concurrency,
+                on_result,
+                on_error,
+            )
+        finally:
+            await client.aclose()
+
+    asyncio.run(runner())
+
+def clean_main(argv: List[str]) -> None:
+    """
+    `main.py clean`: re-run the cleaner over an existing JSONL archive of
+    {"videoId", "transcript"} rows without fetching anything. The archive
+    may be sharded: pass its manifest or a single (compressed) shard. The
+    raw text comes from a row's "raw" field, else from the transcript
+    cache, else the stored transcript itself is cleaned again.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py clean",
+        description="Re-clean the transcripts of a JSONL archive written with --format jsonl.",
+    )
+    parser.add_argument(
+        "--input",
+        "-i",
+        type=str,
+        required=True,
+        help="JSONL archive to re-clean ('-' reads stdin), or the manifest or one shard of a sharded archive.",
+    )
+    parser.add_argument("--output", "-o", type=str, default=None, help="JSONL path to write. If omitted, prints to stdout.")
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="Cleaning processes (default: one per CPU).",
+    )
+    parser.add_argument("--chunk-size", type=int, default=256, help="Transcripts per task sent to a worker.")
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Write rows as their chunk finishes instead of in archive order.",
+    )
+    parser.add_argument("--cache-dir", type=str, default=None, help="Transcript cache holding the raw text.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not look up raw text in the cache.")
+    args = parser.parse_args(argv)
+
+    base_dir = Path(__file__).resolve().parent
+    config = load_settings(base_dir / "config")
+    try:
+        json_backend.use(config.get("json_backend", "auto"))
+    except ValueError as e:
+        parser.error(str(e))
+    cache = None
+    if not args.no_cache:
+        cache_dir = Path(args.cache_dir or config.get("cache_dir") or default_cache_dir())
+        if (cache_dir / TranscriptCache.FILENAME).exists():
+            cache = TranscriptCache(cache_dir)
+
+    # Sharded archives (the manifest or one .gz/.zst shard) are read as bytes.
+    shard_lines = None
+    if args.input.endswith((".manifest.json", ".gz", ".zst")):
+        try:
+            shard_lines = read_jsonl_lines(args.input)
+        except (OSError, ValueError, ImportError) as e:
+            parser.error(str(e))
+
+    # Rows wait here (by position) until their cleaned text comes back.
+    pending: Dict[int, Dict[str, Any]] = {}
+    queue: deque = deque()
+    from_cache = 0
+
+    def texts() -> Iterable[str]:
+        nonlocal from_cache
+        if shard_lines is not None:
+            f = shard_lines
+        else:
+            f = open(args.input, "r", encoding="utf-8") if args.input != "-" else sys.stdin
+        try:
+            for index, line in enumerate(l for l in f if l.strip()):
+                row = json_backend.loads(line)
+                raw = row.get("raw")
+                if raw is None and cache is not None and row.get("videoId"):
+                    hit = cache.get(row["videoId"])
+                    if hit is not None:
+                        raw = hit[0]
+                        from_cache += 1
+                if args.unordered:
+                    pending[index] = row
+                else:
+                    queue.append(row)
+                yield raw if raw is not None else row.get("transcript") or ""
+        finally:
+            if f is not sys.stdin and shard_lines is None:
+                f.close()
+
+    out = JsonlWriter(args.output)
+    empty = 0
+    t0 = time.perf_counter()
+    try:
+        for res in clean_transcripts(
+            texts(), workers=args.workers or os.cpu_count() or 1, chunk_size=args.chunk_size, ordered=not args.unordered
+        ):
+            if args.unordered:
+                index, cleaned = res
+                row = pending.pop(index)
+            else:
+                cleaned, row = res, queue.popleft()
+            empty += not cleaned
+            row["transcript"] = cleaned
+            out.write(row)
+    finally:
+        out.close()
+        if cache is not None:
+            cache.close()
+
+    print(
+        f"Cleaned {out.count} transcripts ({from_cache} from cached raw text, {empty} empty) "
+        f"in {time.perf_counter() - t0:.1f}s.",
+        file=sys.stderr,
+    )
+
+def search_main(argv: List[str]) -> None:
+    """
+    `main.py search`: full-text query over a database written with
+    --format sqlite. Prints one "videoId<TAB>snippet" line per match, best
+    first; exits 1 when nothing matches.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py search",
+        description="Search the transcripts of a database written with --format sqlite.",
+    )
+    parser.add_argument("database", type=str, help="SQLite file written with --format sqlite.")
+    parser.add_argument(
+        "query",
+        type=str,
+        nargs="+",
+        help='FTS5 query: words (all must match), "exact phrases", OR, NOT, prefix*. Words are joined by spaces.',
+    )
+    parser.add_argument("--limit", "-n", type=int, default=20, help="Most matches to print.")
+    parser.add_argument("--json", action="store_true", help="Print JSON Lines {videoId, snippet, score} instead.")
+    args = parser.parse_args(argv)
+
+    if not Path(args.database).is_file():
+        parser.error(f"No such database: {args.database}")
+    t0 = time.perf_counter()
+    try:
+        matches = search_transcripts(args.database, " ".join(args.query), limit=args.limit)
+    except sqlite3.OperationalError as e:
+        parser.error(f"Search failed: {e}")
+    elapsed = time.perf_counter() - t0
+
+    for vid, snippet, score in matches:
+        if args.json:
+            print(json_backend.dumps({"videoId": vid, "snippet": snippet, "score": score}))
+        else:
+            print(f"{vid}\t{' '.join(snippet.split())}")
+    print(f"{len(matches)} matches in {elapsed * 1e3:.1f} ms.", file=sys.stderr)
+    sys.exit(0 if matches else 1)
 
 def main():
+    # Subcommands come first; anything else is the fetch command.
+    if len(sys.argv) > 1 and sys.argv[1] == "clean":
+        return clean_main(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == "search":
+        return search_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(
-        description="Extract clean transcripts from Loom videos by URL or ID."
+        description="Extract clean transcripts from Loom videos by URL or ID.",
+        epilog="Run 'main.py clean --help' to re-clean an existing JSONL archive, "
+        "'main.py search --help' to query one written with --format sqlite.",
     )
     parser.add_argument(
         "--input",
         "-i",
         type=str,
         required=True,
-        help="Path to JSON file containing an array of Loom URLs or video IDs.",
+        help="Input file of Loom URLs or video IDs (JSON array, JSONL or plain text); '-' reads stdin.",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        default="auto",
+        help="Input format; 'auto' decides from the extension or first line.",
     )
     parser.add_argument(
         "--output",
@@ -77,6 +380,46 @@ def main():
         default=None,
         help="Path to write output JSON. If omitted, prints to stdout.",
     )
+    parser.add_argument(
+        "--format",
+        "-f",
+        choices=FORMATS,
+        default=None,
+        help="Output format: one JSON array, JSON Lines streamed as results arrive, Parquet written in "
+        "row groups with fetch metadata columns (needs pyarrow), or a SQLite database with a full-text "
+        "index that later runs add to (overrides config).",
+    )
+    parser.add_argument(
+        "--shard-rows",
+        type=int,
+        default=None,
+        help="jsonl: start a new shard (out-00001.jsonl.zst, ...) every N rows, with a manifest (overrides config).",
+    )
+    parser.add_argument(
+        "--shard-mb",
+        type=float,
+        default=None,
+        help="jsonl: start a new shard once a shard holds this many MB of uncompressed JSON (overrides config).",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSIONS,
+        default=None,
+        help="jsonl: compress shards (default with sharding: zstd if installed, else gzip; overrides config).",
+    )
+    parser.add_argument(
+        "--subtitles",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Also write <videoId>.srt/.vtt here for transcripts with caption timing (overrides config).",
+    )
+    parser.add_argument(
+        "--subtitle-format",
+        choices=SUBTITLE_FORMATS,
+        default=None,
+        help="Subtitle file format for --subtitles (overrides config).",
+    )
     parser.add_argument(
         "--workers",
         "-w",
@@ -84,55 +427,351 @@ def main():
         default=None,
         help="Number of concurrent workers (overrides config).",
     )
+    parser.add_argument(
+        "--engine",
+        choices=("threads", "async"),
+        default=None,
+        help="Fetch engine: thread pool or asyncio (overrides config).",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("requests", "http2"),
+        default=None,
+        help="HTTP transport of the threaded engine: requests (HTTP/1.1) or httpx with HTTP/2 (overrides config).",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Processes that parse pages and clean transcripts while --workers only download; "
+        "0 does it all in the fetch workers (overrides config).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted jsonl or sqlite run: skip inputs its journal lists as done and add to --output.",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="With --resume, also refetch inputs that failed in the previous run.",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        default=None,
+        help="Checkpoint journal path (default: next to --output, e.g. out.journal.jsonl).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory for the persistent transcript cache (overrides config).",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=None,
+        help="Seconds before a cached transcript is refetched; 0 keeps entries forever.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the transcript cache.",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Log per-page parsing metrics and print their totals.",
+    )
     args = parser.parse_args()
 
     base_dir = Path(__file__).resolve().parent
     config = load_settings(base_dir / "config")
+    if args.verbose:
+        logging.basicConfig(format="[%(name)s] %(message)s")
+        logging.getLogger("extractor").setLevel(logging.DEBUG)
+    try:
+        json_backend.use(config.get("json_backend", "auto"))
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Peek before any output is opened, so an empty input leaves it untouched.
+    inputs = iter_input(args.input, args.input_format)
+    first = next(inputs, None)
+    if first is None:
+        print("No inputs provided.", file=sys.stderr)
+        sys.exit(1)
 
     ua = config.get("user_agent", "LoomTranscriptScraper/1.0")
     timeout = int(config.get("timeout_seconds", 20))
     proxy = config.get("proxy")
     pretty = bool(config.get("output_pretty", True))
-    workers = args.workers or int(config.get("concurrent_workers", 4))
+    engine = args.engine or config.get("engine", "threads")
+    if engine == "async":
+        workers = args.workers or int(config.get("async_concurrency", 200))
+    else:
+        workers = args.workers or int(config.get("concurrent_workers", 4))
 
-    client = LoomClient(user_agent=ua, timeout_seconds=timeout, proxy=proxy)
+    transport = args.transport or config.get("http_transport", "requests")
+    if transport == "http2" and engine == "async":
+        parser.error("--transport http2 is only available with --engine threads")
 
-    items = parse_input(Path(args.input))
-    if not items:
-        print("No inputs provided.", file=sys.stderr)
-        sys.exit(1)
+    # Shared by every worker so dead caption endpoints are learned once per
+    # run (or across runs when strategy_stats_path is set).
+    stats = StrategyStats() if config.get("adaptive_strategies", True) else None
+    stats_path = config.get("strategy_stats_path")
+    if stats is not None and stats_path:
+        stats.load(Path(stats_path))
+
+    connections = ConnectionStats()
+    transfer = TransferStats()
+    # One limiter for the whole run, whichever engine and transport fetch;
+    # off unless rate_limit_per_host is set.
+    limiter = None
+    if config.get("rate_limit_per_host"):
+        limiter = RateLimiter(
+            per_host_rate=float(config["rate_limit_per_host"]),
+            global_rate=config.get("rate_limit_global"),
+            burst=float(config.get("rate_limit_burst", 20)),
+            min_rate=float(config.get("rate_limit_min", 0.5)),
+        )
+    keep_alive = bool(config.get("http_keep_alive", True))
+    client_kwargs: Dict[str, Any] = {
+        "user_agent": ua,
+        "timeout_seconds": timeout,
+        "proxy": proxy,
+        "base_url": config.get("base_url") or LOOM_BASE_URL,
+        "strategy_stats": stats,
+        "retry_policy": RetryPolicy(
+            max_retries=int(config.get("max_retries", 3)),
+            backoff_base=float(config.get("retry_backoff_base", 0.8)),
+            backoff_max=float(config.get("retry_backoff_max", 6)),
+            retry_statuses=config.get("retry_statuses", (429, 500, 502, 503, 504)),
+        ),
+        "json_walker": JsonWalker(
+            max_nodes=int(config.get("json_walk_max_nodes", 100000)),
+            max_chars=int(config.get("json_walk_max_chars", 16000000)),
+        ),
+        "keep_alive": keep_alive,
+        "connection_stats": connections,
+        "rate_limiter": limiter,
+        "stream_pages": bool(config.get("stream_pages", True)),
+        "max_page_bytes": int(float(config.get("page_max_mb", 16)) * 1024 * 1024),
+        # Opt-in br/zstd (when the transport can decode them)
+        "compression": bool(config.get("http_compression", False)),
+        "transfer_stats": transfer,
+    }
+
+    cache = None
+    if not args.no_cache:
+        cache_ttl = args.cache_ttl if args.cache_ttl is not None else config.get("cache_ttl_seconds", 604800)
+        cache_mb = config.get("cache_max_mb", 1024)
+        cache = TranscriptCache(
+            Path(args.cache_dir or config.get("cache_dir") or default_cache_dir()),
+            ttl_seconds=cache_ttl,
+            max_bytes=int(float(cache_mb) * 1024 * 1024) if cache_mb else None,
+        )
+
+    # The cache also holds page validators for conditional requests.
+    client_kwargs["page_cache"] = cache
+
+    parse_workers = args.parse_workers if args.parse_workers is not None else int(config.get("parse_workers") or 0)
+    parse_pool = None
+    if parse_workers > 0:
+        parse_pool = ParsePool(
+            parse_workers, queue_size=config.get("parse_queue"), json_walker=client_kwargs["json_walker"]
+        )
+        client_kwargs["page_parser"] = parse_pool
+
+    fmt = args.format or config.get("output_format", "json")
+    # Only appendable streaming output can be checkpointed.
+    journal_path = None
+    if args.output and fmt in ("jsonl", "sqlite"):
+        journal_path = args.journal or str(Path(args.output).with_suffix(".journal.jsonl"))
+    if args.resume and journal_path is None:
+        parser.error("--resume requires --output with --format jsonl or sqlite")
 
-    results: List[Dict[str, str]] = []
-    errors: List[Dict[str, str]] = []
+    skip: frozenset = frozenset()
+    previously_done = 0
+    if args.resume:
+        done, failed = Journal(journal_path).load()
+        skip = frozenset(done if args.retry_failed else done | failed)
+        previously_done = len(done)
+        print(f"Resuming from {journal_path}: {len(skip)} inputs already finished.", file=sys.stderr)
 
-    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
-        future_map = {pool.submit(process_one, client, it): it for it in items}
-        for fut in as_completed(future_map):
-            original = future_map[fut]
+    stream_opts = {
+        "buffer_bytes": int(config.get("output_buffer_kb", 256)) * 1024,
+        "fsync_seconds": float(config.get("output_fsync_seconds", 5)),
+    }
+    result_opts = dict(stream_opts)
+    shard_rows = args.shard_rows or config.get("shard_rows")
+    shard_mb = args.shard_mb or config.get("shard_mb")
+    compression = args.compress or config.get("output_compression")
+    sharded = bool(shard_rows or shard_mb or compression)
+    if sharded and (fmt != "jsonl" or not args.output):
+        parser.error("--shard-rows/--shard-mb/--compress require --format jsonl with --output")
+    if fmt == "jsonl":
+        result_opts["append"] = args.resume
+        if sharded:
+            result_opts.update(
+                shard_rows=int(shard_rows) if shard_rows else None,
+                shard_bytes=int(float(shard_mb) * 1024 * 1024) if shard_mb else None,
+                compression=compression,
+            )
+    elif fmt == "parquet":
+        result_opts = {
+            "row_group_rows": int(config.get("parquet_row_group_rows", 10000)),
+            "compression": config.get("parquet_compression", "zstd"),
+        }
+    elif fmt == "sqlite":
+        result_opts = {
+            "batch_rows": int(config.get("sqlite_batch_rows", 500)),
+            "fsync_seconds": stream_opts["fsync_seconds"],
+        }
+    if fmt in ("parquet", "sqlite") and not args.output:
+        parser.error(f"--format {fmt} requires --output")
+    try:
+        results = open_writer(args.output, fmt, pretty=pretty, **result_opts)
+    except (ImportError, RuntimeError, ValueError) as e:
+        parser.error(str(e))
+    # Errors go to a sidecar next to --output, created only if needed;
+    # without --output they are listed on stderr at the end. Parquet and
+    # SQLite runs report them as JSON Lines, which --resume appends to.
+    err_fmt = "jsonl" if fmt in ("parquet", "sqlite") else fmt
+    err_path = sidecar_path(args.output, err_fmt) if args.output else None
+    errors = None
+    if err_path:
+        errors = open_writer(err_path, err_fmt, pretty=True, lazy=True, append=args.resume, **stream_opts)
+    stderr_errors: List[Dict[str, str]] = []
+    journal = None
+    if journal_path:
+        journal = Journal(journal_path, stream_opts["fsync_seconds"], depends_on=(results, errors))
+        journal.open(append=args.resume)
+
+    subtitles_dir = args.subtitles or config.get("subtitles_dir")
+    subtitles = None
+    if subtitles_dir:
+        subtitles = SubtitleWriter(subtitles_dir, args.subtitle_format or config.get("subtitle_format", "srt"))
+
+    def write_result(res: Tuple[str, Captions, Dict[str, Any]]) -> None:
+        vid, captions, info = res
+        row = {"videoId": vid, "transcript": captions.text}
+        if fmt == "parquet":
+            # Columnar output also carries the fetch metadata
+            row.update(info, transcriptBytes=len(row["transcript"].encode("utf-8")), segments=len(captions))
+        results.write(row)
+        if subtitles is not None:
+            subtitles.write(vid, captions)
+        if journal is not None:
+            journal.record(vid, True)
+        print(f"[OK] {vid}", file=sys.stderr)
+
+    def report_error(key: str, originals: List[str], e: Exception) -> None:
+        for original in originals:
+            row = {"input": original, "error": str(e)}
+            if errors is not None:
+                errors.write(row)
+            else:
+                stderr_errors.append(row)
+            print(f"[ERR] {original} -> {e}", file=sys.stderr)
+        if journal is not None:
+            journal.record(key, False)
+
+    # Inputs are streamed and canonicalized lazily: one fetch per distinct
+    # video, invalid inputs reported without occupying a worker.
+    planner = InputPlanner(chain((first,), inputs), report_error, skip)
+
+    def on_result(vid: str, res: Tuple[str, str]) -> None:
+        planner.finish(vid)
+        write_result(res)
+
+    def on_error(vid: str, e: Exception) -> None:
+        # Fan the failure back out to every input that named this video.
+        report_error(vid, planner.finish(vid, e), e)
+
+    try:
+        if engine == "async":
+            if keep_alive:
+                client_kwargs["keepalive_seconds"] = float(config.get("http_keepalive_seconds", 15))
+            run_async_engine(client_kwargs, planner, workers, on_result, on_error, cache, parse_pool)
+        else:
+            # Size the per-host pool to the thread count (config may override).
+            pool_maxsize = int(config.get("http_pool_maxsize") or workers)
+            if transport == "http2":
+                # Imported lazily so the default transport does not require httpx.
+                from extractor.http2_client import Http2LoomClient
+
+                client = Http2LoomClient(
+                    pool_maxsize=pool_maxsize,
+                    keepalive_seconds=float(config.get("http_keepalive_seconds", 15)),
+                    **client_kwargs,
+                )
+            else:
+                client = LoomClient(
+                    pool_maxsize=pool_maxsize,
+                    pool_block=bool(config.get("http_pool_block", False)),
+                    **client_kwargs,
+                )
             try:
-                vid, transcript = fut.result()
-                results.append({"videoId": vid, "transcript": transcript})
-                print(f"[OK] {vid}", file=sys.stderr)
-            except Exception as e:
-                errors.append({"input": original, "error": str(e)})
-                print(f"[ERR] {original} -> {e}", file=sys.stderr)
-
-    # Write outputs
-    write_json(results, args.output, pretty=pretty)
-
-    # If any failures, also emit a sidecar error file next to --output (or stderr)
-    if errors:
-        if args.output:
-            err_path = Path(args.output).with_suffix(".errors.json")
-            write_json(errors, str(err_path), pretty=True)
+                run_threaded(
+                    lambda vid: process_one(client, vid, cache, parse_pool),
+                    planner,
+                    workers,
+                    on_result,
+                    on_error,
+                    max_in_flight=config.get("max_in_flight"),
+                )
+            finally:
+                client.close()
+    finally:
+        # Flush whatever has been produced even if the run is interrupted.
+        results.close()
+        if errors is not None:
+            errors.close()
+        if journal is not None:
+            journal.close()
+        if parse_pool is not None:
+            parse_pool.close()
+
+    print(
+        f"Inputs: {planner.inputs} read, {planner.videos} videos fetched, "
+        f"{planner.duplicates} duplicates, {planner.invalid} invalid, {planner.skipped} skipped.",
+        file=sys.stderr,
+    )
+    print(f"Connections: {connections.summary()}", file=sys.stderr)
+    # Per transcript actually downloaded; cache hits cost no traffic.
+    downloaded = results.count - (cache.hits if cache is not None else 0)
+    print(f"Transfer: {transfer.summary(max(0, downloaded))}", file=sys.stderr)
+    if limiter is not None:
+        print(f"Rate limit: {limiter.summary()}", file=sys.stderr)
+    if subtitles is not None:
+        print(f"Subtitles: {subtitles.summary()}", file=sys.stderr)
+    if sharded:
+        print(f"Shards: {results.summary()}", file=sys.stderr)
+
+    if cache is not None:
+        print(f"Cache: {cache.hits} hits, {cache.misses} misses ({cache.path})", file=sys.stderr)
+        cache.close()
+
+    if args.verbose:
+        print(f"JSON walk: {client_kwargs['json_walker'].summary()}", file=sys.stderr)
+        print(f"JSON backend: {json_backend.name}", file=sys.stderr)
+
+    if stats is not None and stats_path:
+        stats.save(Path(stats_path))
+
+    if errors is not None:
+        if errors.count:
             print(f"Wrote error report to {err_path}", file=sys.stderr)
-        else:
-            print("\nErrors:", file=sys.stderr)
-            for e in errors:
-                print(json.dumps(e, ensure_ascii=False), file=sys.stderr)
+    elif stderr_errors:
+        print("\nErrors:", file=sys.stderr)
+        for e in stderr_errors:
+            print(json_backend.dumps(e), file=sys.stderr)
 
     # Exit code reflects partial success: 0 if some results, 2 if none
-    sys.exit(0 if results else 2)
+    sys.exit(0 if results.count or previously_done else 2)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from extractor import json_backend
+
+class Journal:
+    """
+    Append-only record of which inputs a run has finished.
+
+    One JSON line per finished input: {"key": <videoId or raw input>,
+    "status": "ok" | "error"}. The last line for a key wins, so a video that
+    failed once and later succeeded counts as done.
+
+    Entries are held in memory and only written by sync(), after the
+    writers passed as `depends_on` have been synced, so the journal never
+    claims a row that is not yet durable in the output.
+    """
+
+    def __init__(self, path: str, fsync_seconds: float = 5.0, depends_on: Iterable[Any] = ()):
+        self.path = Path(path)
+        self.fsync_seconds = fsync_seconds
+        self.depends_on = [w for w in depends_on if w is not None]
+        self._f: Optional[Any] = None
+        self._pending: List[str] = []
+        self._last_sync = time.monotonic()
+
+    def load(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Return (done, failed) keys recorded so far; a missing journal is empty.
+        A torn last line from a crash is ignored.
+        """
+        status = {}
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json_backend.loads(line)
+                        status[entry["key"]] = entry["status"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        done = {k for k, v in status.items() if v == "ok"}
+        failed = {k for k, v in status.items() if v != "ok"}
+        return done, failed
+
+    def open(self, append: bool) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("a" if append else "w", encoding="utf-8")
+
+    def record(self, key: str, ok: bool) -> None:
+        self._pending.append(json_backend.dumps({"key": key, "status": "ok" if ok else "error"}) + "\n")
+        now = time.monotonic()
+        if now - self._last_sync >= self.fsync_seconds:
+            self.sync()
+            self._last_sync = now
+
+    def sync(self) -> None:
+        for w in self.depends_on:
+            w.sync()
+        if self._f is not None:
+            self._f.write("".join(self._pending))
+            self._pending = []
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        self.sync()
+        self._f.close()
+        self._f = None
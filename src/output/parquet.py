@@ -0,0 +1,92 @@
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+# Output columns in order: (name, arrow type factory).
+_COLUMNS = (
+    ("videoId", lambda: pa.string()),
+    ("transcript", lambda: pa.large_string()),
+    ("strategy", lambda: pa.string()),
+    ("transcriptBytes", lambda: pa.int64()),
+    ("rawBytes", lambda: pa.int64()),
+    ("segments", lambda: pa.int32()),
+    ("fetchMs", lambda: pa.float64()),
+    ("cleanMs", lambda: pa.float64()),
+    ("fetchedAt", lambda: pa.timestamp("ms", tz="UTC")),
+)
+# Few distinct values: dictionary-encode these, not the free text.
+_DICTIONARY_COLUMNS = ["strategy"]
+
+class ParquetWriter:
+    """
+    Streams rows into a Parquet file, one row group per `row_group_rows`
+    rows (or sooner once the buffered transcripts reach `row_group_bytes`),
+    so memory stays bounded however long the run is. Columns are those of
+    _COLUMNS; keys a row lacks are written as nulls.
+
+    The file is only readable once close() has written its footer. With
+    `lazy=True` nothing is created if no row was ever added.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lazy: bool = False,
+        row_group_rows: int = 10_000,
+        row_group_bytes: int = 64 * 1024 * 1024,
+        compression: str = "zstd",
+        compression_level: Optional[int] = None,
+    ):
+        if pa is None:
+            raise ImportError("--format parquet requires pyarrow (pip install pyarrow).")
+        self.path = path
+        self.row_group_rows = max(1, row_group_rows)
+        self.row_group_bytes = max(1, row_group_bytes)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.schema = pa.schema([(name, kind()) for name, kind in _COLUMNS])
+        self.count = 0
+        self.row_groups = 0
+        self._columns: Dict[str, List[Any]] = {name: [] for name, _ in _COLUMNS}
+        self._buffered_bytes = 0
+        self._writer: Any = None
+        if not lazy:
+            self._open()
+
+    def _open(self) -> None:
+        self._writer = pq.ParquetWriter(
+            self.path,
+            self.schema,
+            compression=self.compression,
+            compression_level=self.compression_level,
+            use_dictionary=_DICTIONARY_COLUMNS,
+        )
+
+    def write(self, row: Dict) -> None:
+        for name, values in self._columns.items():
+            values.append(row.get(name))
+        self.count += 1
+        self._buffered_bytes += len(row.get("transcript") or "")
+        if len(self._columns["videoId"]) >= self.row_group_rows or self._buffered_bytes >= self.row_group_bytes:
+            self.sync()
+
+    def sync(self) -> None:
+        """Write the buffered rows as a row group."""
+        if not self._columns["videoId"]:
+            return
+        if self._writer is None:
+            self._open()
+        self._writer.write_table(pa.Table.from_pydict(self._columns, schema=self.schema))
+        self.row_groups += 1
+        self._columns = {name: [] for name in self._columns}
+        self._buffered_bytes = 0
+
+    def close(self) -> None:
+        self.sync()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,348 @@
+import gzip
+import hashlib
+import itertools
+import logging
+import os
+import re
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from extractor import json_backend
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+_DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+# Suffixes stripped from --output to get the shard name stem.
+_OUTPUT_SUFFIXES = (".jsonl", ".json", ".gz", ".zst")
+_READ_CHUNK = 1024 * 1024
+_DECODE_ERRORS = (zlib.error, ValueError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+class _HashingFile:
+    """Binary file that checksums and counts everything written to it."""
+
+    def __init__(self, path: Path):
+        self._f = open(path, "wb")
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._f.write(data)
+        self.sha256.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def fileno(self) -> int:
+        return self._f.fileno()
+
+    def close(self) -> None:
+        self._f.close()
+
+class _Shard:
+    """One open shard file: a compressor stream over a _HashingFile."""
+
+    def __init__(self, path: Path, first_row: int, compression: str, level: Optional[int]):
+        self.path = path
+        self.first_row = first_row
+        self.rows = 0
+        self.data_bytes = 0
+        self.first_id: Optional[str] = None
+        self.last_id: Optional[str] = None
+        self.raw = _HashingFile(path)
+        self.compression = compression
+        if compression == "gzip":
+            # mtime=0 keeps the checksum a function of the rows alone.
+            self.stream: Any = gzip.GzipFile(fileobj=self.raw, mode="wb", compresslevel=level, mtime=0)
+        elif compression == "zstd":
+            self.stream = zstandard.ZstdCompressor(level=level).stream_writer(self.raw, closefd=False)
+        else:
+            self.stream = self.raw
+
+    def sync(self) -> None:
+        # A sync flush ends the compressed data on a block boundary, so
+        # everything written so far can be read back after a crash.
+        if self.stream is not self.raw:
+            self.stream.flush()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+
+    def close(self) -> Dict[str, Any]:
+        if self.stream is not self.raw:
+            self.stream.close()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        self.raw.close()
+        return {
+            "file": self.path.name,
+            "rows": self.rows,
+            "firstRow": self.first_row,
+            "lastRow": self.first_row + self.rows - 1,
+            "firstVideoId": self.first_id,
+            "lastVideoId": self.last_id,
+            "bytes": self.raw.size,
+            "dataBytes": self.data_bytes,
+            "sha256": self.raw.sha256.hexdigest(),
+        }
+
+def _read_lines(path: Path, limit: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Complete lines of a shard that may have been cut off mid-write, reading
+    at most `limit` bytes of it (the part known to end on a flush).
+    """
+    name = path.name[: -len(".partial")] if path.name.endswith(".partial") else path.name
+    if name.endswith(".gz"):
+        decompress = zlib.decompressobj(wbits=31).decompress
+    elif name.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError(f"Recovering {path.name} requires zstandard (pip install zstandard).")
+        decompress = zstandard.ZstdDecompressor().decompressobj().decompress
+    else:
+        decompress = bytes
+    tail = b""
+    remaining = limit if limit is not None else float("inf")
+    with open(path, "rb") as f:
+        while remaining > 0:
+            chunk = f.read(int(min(_READ_CHUNK, remaining)))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            try:
+                data = tail + decompress(chunk)
+            except _DECODE_ERRORS:
+                return
+            lines = data.split(b"\n")
+            tail = lines.pop()
+            yield from lines
+
+def read_jsonl_lines(path: str) -> Iterator[bytes]:
+    """
+    Lines of sharded JSON Lines output, given its manifest (every listed
+    shard, in order) or one shard file, compressed or not. A shard still
+    open when its run stopped is not listed; resume the run to recover it.
+    """
+    p = Path(path)
+    if p.name.endswith(".manifest.json"):
+        manifest = json_backend.loads(p.read_bytes())
+        files = [p.parent / s["file"] for s in manifest.get("shards", [])]
+    else:
+        files = [p]
+    for f in files:
+        if not f.exists():
+            raise FileNotFoundError(f"No such shard: {f}")
+    if zstandard is None and any(f.name.endswith(".zst") for f in files):
+        raise ImportError("Reading .zst shards requires zstandard (pip install zstandard).")
+    return itertools.chain.from_iterable(_read_lines(f) for f in files)
+
+class ShardedJsonlWriter:
+    """
+    JSON Lines split into numbered, compressed shards next to `path`:
+    out.jsonl becomes out-00001.jsonl.zst, out-00002.jsonl.zst, ... plus
+    out.manifest.json.
+
+    A shard is closed once it holds `shard_rows` rows or `shard_bytes` of
+    uncompressed JSON (whichever comes first; neither means one shard).
+    Each closed shard is added to the manifest with its row range,
+    first/last videoId, sizes and SHA-256, and the manifest is rewritten
+    atomically, so "shards" only ever lists complete files; "open" names
+    the shard still being written and how many of its bytes were synced.
+    `compression` is "zstd" (needs zstandard), "gzip" or "none"; None picks
+    zstd when available.
+
+    Rows are buffered up to `buffer_bytes` and the open shard is flushed and
+    fsync'ed at most every `fsync_seconds`, like JsonlWriter. With
+    `append=True` (resume) the manifest's shards are kept and shards a
+    crashed run left unlisted are recovered up to their last sync into new
+    shards; otherwise old shards of the same name are removed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lazy: bool = False,
+        append: bool = False,
+        shard_rows: Optional[int] = None,
+        shard_bytes: Optional[int] = None,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        buffer_bytes: int = 256 * 1024,
+        fsync_seconds: float = 5.0,
+    ):
+        if compression is None:
+            compression = "zstd" if zstandard is not None else "gzip"
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}'. Expected one of: {', '.join(COMPRESSIONS)}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd output requires zstandard (pip install zstandard); or use gzip.")
+        out = Path(path)
+        name = out.name
+        while name.endswith(_OUTPUT_SUFFIXES):
+            name = name.rsplit(".", 1)[0]
+        self.directory = out.parent
+        self.stem = name or "out"
+        self.compression = compression
+        self.level = compression_level if compression_level is not None else _DEFAULT_LEVELS.get(compression)
+        self.shard_rows = shard_rows or None
+        self.shard_bytes = shard_bytes or None
+        self.buffer_bytes = max(1, buffer_bytes)
+        self.fsync_seconds = fsync_seconds
+        self.manifest_path = self.directory / f"{self.stem}.manifest.json"
+        self._pattern = re.compile(rf"{re.escape(self.stem)}-(\d{{5,}})\.jsonl(?:\.gz|\.zst)?(?:\.partial)?")
+        self.shards: List[Dict[str, Any]] = []
+        self.count = 0
+        self._rows = 0
+        self._shard: Optional[_Shard] = None
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._partials: List[Path] = []
+        self._opened = False
+        self._append = append
+        self._last_sync = time.monotonic()
+        if not lazy:
+            self._open()
+
+    def _open(self) -> None:
+        self._opened = True
+        self.directory.mkdir(parents=True, exist_ok=True)
+        existing = sorted(
+            (p for p in self.directory.iterdir() if self._pattern.fullmatch(p.name)),
+            key=lambda p: int(self._pattern.fullmatch(p.name).group(1)),
+        )
+        if not self._append:
+            for p in existing:
+                p.unlink()
+            if self.manifest_path.exists():
+                self.manifest_path.unlink()
+            return
+        try:
+            manifest = json_backend.loads(self.manifest_path.read_bytes())
+        except FileNotFoundError:
+            manifest = {}
+        if manifest and manifest.get("compression") != self.compression:
+            raise ValueError(
+                f"{self.manifest_path} holds {manifest.get('compression')} shards; resume with the same compression."
+            )
+        self.shards = manifest.get("shards", [])
+        self._rows = manifest.get("rows", 0)
+        synced = manifest.get("open") or {}
+        listed = {s["file"] for s in self.shards}
+        for p in existing:
+            if p.name in listed:
+                continue
+            # Left open by an interrupted run: move it aside and copy its
+            # complete rows into new shards.
+            partial = p if p.name.endswith(".partial") else p.rename(p.with_name(p.name + ".partial"))
+            self._partials.append(partial)
+        for partial in self._partials:
+            recovered = 0
+            # Past its last sync a shard may end in a torn write no decoder
+            # gets through; shards never synced are read as far as possible.
+            limit = synced.get("bytes") if partial.name == synced.get("file", "") + ".partial" else None
+            for line in _read_lines(partial, limit):
+                try:
+                    vid = json_backend.loads(line).get("videoId")
+                except ValueError:
+                    continue
+                self._add(line + b"\n", vid)
+                recovered += 1
+            logger.warning("Recovered %d rows from unfinished shard %s", recovered, partial.name)
+        if self._partials:
+            self.sync()
+            for partial in self._partials:
+                partial.unlink()
+            self._partials = []
+
+    def _next_path(self) -> Path:
+        numbers = [int(self._pattern.fullmatch(s["file"]).group(1)) for s in self.shards]
+        ext = _EXTENSIONS[self.compression]
+        return self.directory / f"{self.stem}-{max(numbers, default=0) + 1:05d}.jsonl{ext}"
+
+    def _add(self, line: bytes, video_id: Optional[str]) -> None:
+        if self._shard is None:
+            self._shard = _Shard(self._next_path(), self._rows, self.compression, self.level)
+        shard = self._shard
+        if shard.first_id is None:
+            shard.first_id = video_id
+        shard.last_id = video_id
+        shard.rows += 1
+        shard.data_bytes += len(line)
+        self._rows += 1
+        self._pending.append(line)
+        self._pending_bytes += len(line)
+        if (self.shard_rows and shard.rows >= self.shard_rows) or (
+            self.shard_bytes and shard.data_bytes >= self.shard_bytes
+        ):
+            self._rotate()
+        elif self._pending_bytes >= self.buffer_bytes:
+            self._drain()
+
+    def _drain(self) -> None:
+        if self._pending:
+            self._shard.stream.write(b"".join(self._pending))
+            self._pending = []
+            self._pending_bytes = 0
+
+    def _rotate(self) -> None:
+        self._drain()
+        self.shards.append(self._shard.close())
+        self._shard = None
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "format": "jsonl",
+            "compression": self.compression,
+            "rows": sum(s["rows"] for s in self.shards),
+            "shards": self.shards,
+        }
+        if self._shard is not None:
+            manifest["open"] = {"file": self._shard.path.name, "bytes": self._shard.raw.size}
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        tmp.write_text(json_backend.dumps_pretty(manifest) + "\n", encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def write(self, row: Dict) -> None:
+        if not self._opened:
+            self._open()
+        self._add(json_backend.dumpb(row) + b"\n", row.get("videoId"))
+        self.count += 1
+        now = time.monotonic()
+        if now - self._last_sync >= self.fsync_seconds:
+            self.sync()
+            self._last_sync = now
+
+    def sync(self) -> None:
+        if self._shard is None:
+            return
+        self._drain()
+        self._shard.sync()
+        self._write_manifest()
+
+    def close(self) -> None:
+        if not self._opened:
+            return
+        if self._shard is not None:
+            self._rotate()
+        elif not self.manifest_path.exists():
+            self._write_manifest()
+        self._opened = False
+
+    def summary(self) -> str:
+        data = sum(s["dataBytes"] for s in self.shards)
+        disk = sum(s["bytes"] for s in self.shards)
+        ratio = f", {data / disk:.1f}x" if disk else ""
+        return (
+            f"{len(self.shards)} shards, {sum(s['rows'] for s in self.shards)} rows, "
+            f"{data / 1048576:.1f} MiB -> {disk / 1048576:.1f} MiB {self.compression}{ratio}; "
+            f"manifest {self.manifest_path}"
+        )
@@ -0,0 +1,124 @@
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id   TEXT PRIMARY KEY,
+    transcript TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+    transcript, content='transcripts', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS transcripts_ai AFTER INSERT ON transcripts BEGIN
+    INSERT INTO transcripts_fts (rowid, transcript) VALUES (new.rowid, new.transcript);
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_ad AFTER DELETE ON transcripts BEGIN
+    INSERT INTO transcripts_fts (transcripts_fts, rowid, transcript) VALUES ('delete', old.rowid, old.transcript);
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_au AFTER UPDATE ON transcripts BEGIN
+    INSERT INTO transcripts_fts (transcripts_fts, rowid, transcript) VALUES ('delete', old.rowid, old.transcript);
+    INSERT INTO transcripts_fts (rowid, transcript) VALUES (new.rowid, new.transcript);
+END;
+"""
+
+# An unchanged transcript is left alone, so refetching an archive does not
+# rewrite its index.
+_UPSERT_SQL = (
+    "INSERT INTO transcripts (video_id, transcript, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT (video_id) DO UPDATE SET transcript = excluded.transcript, updated_at = excluded.updated_at "
+    "WHERE transcript IS NOT excluded.transcript"
+)
+
+_SEARCH_SQL = (
+    "SELECT t.video_id, snippet(transcripts_fts, 0, ?, ?, '…', ?), bm25(transcripts_fts) "
+    "FROM transcripts_fts JOIN transcripts t ON t.rowid = transcripts_fts.rowid "
+    "WHERE transcripts_fts MATCH ? ORDER BY rank LIMIT ?"
+)
+
+class SqliteWriter:
+    """
+    Upserts {"videoId", "transcript"} rows into a SQLite database (WAL mode)
+    whose FTS5 table `transcripts_fts` indexes every transcript; see search().
+
+    Rows are buffered and committed in one transaction per `batch_rows`
+    rows, or at least every `fsync_seconds`, so ingest does not pay a commit
+    per video and a crash loses at most the open batch. Existing rows are
+    kept: a later run adds to the archive and replaces only the videos it
+    fetched again. With `lazy=True` nothing is created if no row was ever
+    added.
+    """
+
+    def __init__(self, path: str, lazy: bool = False, batch_rows: int = 500, fsync_seconds: float = 5.0):
+        self.path = path
+        self.batch_rows = max(1, batch_rows)
+        self.fsync_seconds = fsync_seconds
+        self.count = 0
+        self._batch: List[Tuple[str, str, float]] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_sync = time.monotonic()
+        if not lazy:
+            self._open()
+
+    def _open(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self._conn.close()
+            self._conn = None
+            if "fts5" in str(e):
+                raise RuntimeError("--format sqlite requires SQLite built with FTS5.") from e
+            raise
+
+    def write(self, row: Dict) -> None:
+        self._batch.append((row["videoId"], row["transcript"], time.time()))
+        self.count += 1
+        now = time.monotonic()
+        if len(self._batch) >= self.batch_rows or now - self._last_sync >= self.fsync_seconds:
+            self.sync()
+            self._last_sync = now
+
+    def sync(self) -> None:
+        """Commit the buffered rows as one transaction."""
+        if not self._batch:
+            return
+        if self._conn is None:
+            self._open()
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(_UPSERT_SQL, self._batch)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        self._batch = []
+
+    def close(self) -> None:
+        if self._conn is None and not self._batch:
+            return
+        self.sync()
+        # Fold the WAL back into the database file.
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._conn.close()
+        self._conn = None
+
+def search(
+    path: str, query: str, limit: int = 20, marks: Tuple[str, str] = ("[", "]"), snippet_tokens: int = 16
+) -> List[Tuple[str, str, float]]:
+    """
+    Full-text search of a database written by SqliteWriter. `query` uses
+    FTS5 syntax (words, "phrases", AND/OR/NOT, prefix*). Returns
+    (videoId, snippet, bm25 score) for the best `limit` matches, best first;
+    matched terms in the snippet are wrapped in `marks`.
+    """
+    conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        return conn.execute(_SEARCH_SQL, (marks[0], marks[1], snippet_tokens, query, limit)).fetchall()
+    finally:
+        conn.close()
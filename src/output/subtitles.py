@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from extractor.captions import Captions
+
+SUBTITLE_FORMATS = ("srt", "vtt")
+
+class SubtitleWriter:
+    """
+    Writes <videoId>.srt or .vtt into `directory` for every transcript that
+    kept its caption timing; untimed ones are counted and skipped.
+    """
+
+    def __init__(self, directory: str, fmt: str = "srt"):
+        if fmt not in SUBTITLE_FORMATS:
+            raise ValueError(f"Unknown subtitle format: {fmt}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.count = 0
+        self.untimed = 0
+
+    def write(self, video_id: str, captions: Captions) -> None:
+        if not captions.timed:
+            self.untimed += 1
+            return
+        body = captions.to_srt() if self.fmt == "srt" else captions.to_vtt()
+        path = self.directory / f"{video_id}.{self.fmt}"
+        path.write_text(body, encoding="utf-8")
+        self.count += 1
+
+    def summary(self) -> str:
+        return f"{self.count} written to {self.directory}, {self.untimed} without timing"
@@ -1,19 +1,138 @@
-import json
+import os
 import sys
-from typing import List, Dict, Optional
+import time
+from pathlib import Path
+from typing import Any, List, Dict, Optional
+
+from extractor import json_backend
+
+from .shards import ShardedJsonlWriter
 
 def write_json(rows: List[Dict], path: Optional[str] = None, pretty: bool = True) -> None:
     """
     Write list of dicts as JSON to a file or stdout.
     """
-    if pretty:
-        payload = json.dumps(rows, ensure_ascii=False, indent=2)
-    else:
-        payload = json.dumps(rows, ensure_ascii=False, separators=(",", ":"))
+    payload = json_backend.dumps_pretty(rows) if pretty else json_backend.dumps(rows)
 
     if path:
         with open(path, "w", encoding="utf-8") as f:
             f.write(payload + "\n")
     else:
         sys.stdout.write(payload + "\n")
-        sys.stdout.flush()
\ No newline at end of file
+        sys.stdout.flush()
+
+class JsonArrayWriter:
+    """
+    Collects rows and writes them as one JSON array on close (write_json).
+
+    With `lazy=True` nothing is written if no row was ever added, which is
+    how the error sidecar avoids creating empty files.
+    """
+
+    def __init__(self, path: Optional[str] = None, pretty: bool = True, lazy: bool = False):
+        self.path = path
+        self.pretty = pretty
+        self.lazy = lazy
+        self.rows: List[Dict] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+    def write(self, row: Dict) -> None:
+        self.rows.append(row)
+
+    def close(self) -> None:
+        if self.rows or not self.lazy:
+            write_json(self.rows, self.path, pretty=self.pretty)
+
+class JsonlWriter:
+    """
+    Appends one compact JSON object per line as rows arrive.
+
+    Output goes through a file buffer of `buffer_bytes`, and the file is
+    flushed and fsync'ed at most every `fsync_seconds`, so memory stays flat
+    and a crash loses at most the last few seconds of rows. With no path,
+    lines go to stdout and are flushed on the same schedule.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        lazy: bool = False,
+        append: bool = False,
+        buffer_bytes: int = 256 * 1024,
+        fsync_seconds: float = 5.0,
+    ):
+        self.path = path
+        self.append = append
+        self.buffer_bytes = max(1, buffer_bytes)
+        self.fsync_seconds = fsync_seconds
+        self.count = 0
+        self._f: Any = None
+        self._last_sync = time.monotonic()
+        if not lazy:
+            self._open()
+
+    def _open(self) -> None:
+        if self.path:
+            mode = "a" if self.append else "w"
+            self._f = open(self.path, mode, encoding="utf-8", buffering=self.buffer_bytes)
+        else:
+            self._f = sys.stdout
+
+    def write(self, row: Dict) -> None:
+        if self._f is None:
+            self._open()
+        self._f.write(json_backend.dumps(row) + "\n")
+        self.count += 1
+        now = time.monotonic()
+        if now - self._last_sync >= self.fsync_seconds:
+            self.sync()
+            self._last_sync = now
+
+    def sync(self) -> None:
+        if self._f is None:
+            return
+        self._f.flush()
+        if self._f is not sys.stdout:
+            os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        self.sync()
+        if self._f is not sys.stdout:
+            self._f.close()
+        self._f = None
+
+FORMATS = ("json", "jsonl", "parquet", "sqlite")
+SHARD_OPTIONS = ("shard_rows", "shard_bytes", "compression")
+
+def open_writer(path: Optional[str], fmt: str = "json", pretty: bool = True, lazy: bool = False, **options: Any):
+    """
+    Return a row writer (write(row), close(), count) for the output format.
+    Extra options are passed to streaming writers only; jsonl given any
+    of SHARD_OPTIONS is written as compressed shards (ShardedJsonlWriter).
+    """
+    if fmt == "json":
+        return JsonArrayWriter(path, pretty=pretty, lazy=lazy)
+    if fmt == "jsonl":
+        if any(options.get(k) for k in SHARD_OPTIONS):
+            return ShardedJsonlWriter(path, lazy=lazy, **options)
+        options = {k: v for k, v in options.items() if k not in SHARD_OPTIONS}
+        return JsonlWriter(path, lazy=lazy, **options)
+    if fmt == "parquet":
+        # Imported lazily: pyarrow is only needed for this format.
+        from .parquet import ParquetWriter
+
+        return ParquetWriter(path, lazy=lazy, **options)
+    if fmt == "sqlite":
+        from .sqlite import SqliteWriter
+
+        return SqliteWriter(path, lazy=lazy, **options)
+    raise ValueError(f"Unknown output format '{fmt}'. Expected one of: {', '.join(FORMATS)}")
+
+def sidecar_path(output: str, fmt: str = "json") -> str:
+    """Error report path next to `output`, e.g. out.json -> out.errors.json."""
+    return str(Path(output).with_suffix(f".errors.{fmt}"))
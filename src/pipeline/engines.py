@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+ResultCallback = Callable[[str, Any], None]
+ErrorCallback = Callable[[str, Exception], None]
+
+def run_threaded(
+    process: Callable[[str], Any],
+    items: Iterable[str],
+    workers: int,
+    on_result: ResultCallback,
+    on_error: ErrorCallback,
+    max_in_flight: Optional[int] = None,
+) -> None:
+    """
+    Fan `process` out over a thread pool. `items` is consumed lazily and at
+    most `max_in_flight` futures (default 2x workers) exist at a time.
+    Iteration and callbacks run on the calling thread, so they need no locking.
+    """
+    workers = max(1, workers)
+    window = max(workers, max_in_flight or 2 * workers)
+    it = iter(items)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        future_map = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(future_map) < window:
+                try:
+                    item = next(it)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future_map[pool.submit(process, item)] = item
+            if not future_map:
+                break
+            done, _ = wait(future_map, return_when=FIRST_COMPLETED)
+            for fut in done:
+                original = future_map.pop(fut)
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    on_error(original, e)
+                    continue
+                on_result(original, result)
+
+async def run_async(
+    process: Callable[[str], Awaitable[Any]],
+    items: Iterable[str],
+    concurrency: int,
+    on_result: ResultCallback,
+    on_error: ErrorCallback,
+) -> None:
+    """
+    Run the coroutine `process` for every item with at most `concurrency`
+    in flight. A fixed set of worker tasks pulls from `items` lazily, so no
+    task or coroutine exists for items not yet started. Callbacks run on
+    the event loop thread, mirroring run_threaded.
+    """
+    it = iter(items)
+
+    async def worker() -> None:
+        # Single-threaded loop: next() between awaits is race-free.
+        for item in it:
+            try:
+                result = await process(item)
+            except Exception as e:
+                on_error(item, e)
+                continue
+            on_result(item, result)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
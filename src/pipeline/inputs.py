@@ -0,0 +1,171 @@
+import io
+import json
+import sys
+from typing import Any, Iterator, TextIO, Tuple
+
+from extractor import json_backend
+
+INPUT_FORMATS = ("auto", "json", "jsonl", "text")
+
+_CHUNK = 64 * 1024
+_INVALID_JSON = "Input JSON must be an array of URLs/IDs or an object with 'items' array."
+
+def _item_to_str(x: Any) -> str:
+    # JSONL exports sometimes carry objects rather than bare strings.
+    if isinstance(x, dict):
+        for key in ("url", "videoId", "id", "input"):
+            if key in x:
+                return str(x[key])
+    return str(x)
+
+def iter_json_array(f: TextIO, prefix: str = "") -> Iterator[str]:
+    """
+    Incrementally yield the elements of a top-level JSON array, or of the
+    "items" array of a top-level object, reading `f` in fixed-size chunks.
+    Only one element (plus one chunk) is held in memory at a time; members
+    of the object before "items" are decoded one at a time and dropped. Uses
+    the stdlib decoder: it is the one that can stop after an element.
+    """
+    decoder = json.JSONDecoder()
+    buf = prefix
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(_CHUNK)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or not fill():
+                return
+
+    def decode() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                # Value straddles a chunk boundary: read more and retry.
+                if not fill():
+                    raise
+                continue
+            if isinstance(value, (int, float)) and not eof and (end == len(buf) or buf[end] not in " \t\r\n,]}"):
+                # A number cut by the chunk boundary ("1.5e|10") parses short.
+                if fill():
+                    continue
+            pos = end
+            return value
+
+    # Locate the opening bracket of the array we stream.
+    skip(" \t\r\n")
+    if buf[pos:pos + 1] == "[":
+        pos += 1
+    elif buf[pos:pos + 1] == "{":
+        pos += 1
+        # Step over the object's members so that only its own "items" key
+        # counts, not one nested in an earlier member.
+        while True:
+            skip(" \t\r\n,")
+            if buf[pos:pos + 1] != '"':
+                raise ValueError(_INVALID_JSON)
+            key = decode()
+            skip(" \t\r\n:")
+            if key == "items":
+                if buf[pos:pos + 1] != "[":
+                    raise ValueError(_INVALID_JSON)
+                pos += 1
+                break
+            decode()
+    else:
+        raise ValueError(_INVALID_JSON)
+
+    while True:
+        # Skip whitespace and separators between elements.
+        skip(" \t\r\n,")
+        if pos >= len(buf):
+            raise ValueError("Input JSON ended before the items array was closed.")
+        if buf[pos] == "]":
+            return
+        yield str(decode())
+
+def iter_jsonl(f: TextIO) -> Iterator[str]:
+    for line in f:
+        line = line.strip()
+        if line:
+            yield _item_to_str(json_backend.loads(line))
+
+def iter_text(f: TextIO) -> Iterator[str]:
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+def _sniff(f: TextIO) -> Tuple[str, str]:
+    """
+    Guess the format from the first line. Returns (format, line consumed),
+    and the caller replays that line in front of the rest of the stream.
+    """
+    first = f.readline()
+    head = first.lstrip()
+    if head.startswith("["):
+        fmt = "json"
+    elif head.startswith("{"):
+        try:
+            obj = json_backend.loads(first)
+        except ValueError:
+            obj = None
+        # A whole {"items": [...]} document may fit on one line.
+        fmt = "jsonl" if isinstance(obj, dict) and "items" not in obj else "json"
+    elif head.startswith('"'):
+        fmt = "jsonl"
+    else:
+        fmt = "text"
+    return fmt, first
+
+def iter_input(path: str, fmt: str = "auto") -> Iterator[str]:
+    """
+    Stream input items (URLs or IDs) from a file, or from stdin when path is "-".
+
+    Formats: "json" (array or {"items": [...]}, parsed incrementally),
+    "jsonl"/NDJSON (one string or object with a url/videoId/id field per
+    line) and "text" (one item per line, '#' comments allowed). "auto"
+    picks by file extension, then by sniffing the first line.
+    """
+    if fmt not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format '{fmt}'. Expected one of: {', '.join(INPUT_FORMATS)}")
+
+    if fmt == "auto" and path != "-":
+        lower = path.lower()
+        if lower.endswith((".jsonl", ".ndjson")):
+            fmt = "jsonl"
+        elif lower.endswith(".txt"):
+            fmt = "text"
+        elif lower.endswith(".json"):
+            fmt = "json"
+
+    own = path != "-"
+    f: TextIO = open(path, "r", encoding="utf-8") if own else sys.stdin
+    try:
+        prefix = ""
+        if fmt == "auto":
+            fmt, prefix = _sniff(f)
+        if fmt == "json":
+            yield from iter_json_array(f, prefix)
+            return
+        reader = iter_jsonl if fmt == "jsonl" else iter_text
+        if prefix:
+            yield from reader(io.StringIO(prefix))
+        yield from reader(f)
+    finally:
+        if own:
+            f.close()
@@ -0,0 +1,108 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from extractor import json_backend
+from extractor.captions import Captions, Transcript
+from extractor.json_walk import JsonWalker
+from extractor.loom_client import _LoomBase
+from extractor.transcript_cleaner import clean_captions
+
+# Walk budgets of this worker process, set by _init_worker.
+_walk_limits: Tuple[int, int] = (100_000, 16_000_000)
+
+def _init_worker(max_nodes: int, max_chars: int, backend: str = "auto") -> None:
+    global _walk_limits
+    _walk_limits = (max_nodes, max_chars)
+    # Decode with the parent's JSON backend, not whatever "auto" finds here.
+    json_backend.use(backend)
+
+def _parse_page(html: str) -> Tuple[Optional[Transcript], tuple]:
+    # Runs in a worker process: the same heuristics as the clients, with a
+    # fresh walker so its totals can be handed back to the parent.
+    parser = _LoomBase()
+    parser.json_walker = JsonWalker(*_walk_limits)
+    return parser._parse_share_page_for_transcript(html), parser.json_walker.totals()
+
+def _parse_script(content: str) -> Tuple[Optional[Transcript], tuple]:
+    # One <script> body of a page being streamed; see _parse_page.
+    parser = _LoomBase()
+    parser.json_walker = JsonWalker(*_walk_limits)
+    return parser._parse_script_for_transcript(content), parser.json_walker.totals()
+
+def _mp_context():
+    # I/O threads are already running when workers start; forking a
+    # threaded process is unsafe, so prefer a fork server.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+class ParsePool:
+    """
+    CPU stage of the fetch pipeline: share/embed page (or streamed script)
+    parsing and transcript cleaning run in `workers` processes while the
+    I/O workers only download.
+
+    At most `queue_size` jobs (default 2x workers) are queued or running;
+    an I/O worker handing over a page beyond that waits for a slot, so a
+    backlog of downloaded pages cannot grow without bound. Walk metrics
+    from the workers are folded into `json_walker`.
+    """
+
+    def __init__(self, workers: int, queue_size: Optional[int] = None, json_walker: Optional[JsonWalker] = None):
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size or 2 * self.workers)
+        self.json_walker = json_walker or JsonWalker()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=_mp_context(),
+            initializer=_init_worker,
+            initargs=(self.json_walker.max_nodes, self.json_walker.max_chars, json_backend.name),
+        )
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._async_slots: Optional[asyncio.Semaphore] = None
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        self._slots.acquire()
+        try:
+            fut = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        fut.add_done_callback(lambda _: self._slots.release())
+        return fut
+
+    def _page_result(self, res: Tuple[Optional[Transcript], tuple]) -> Optional[Transcript]:
+        text, totals = res
+        self.json_walker.add_totals(totals)
+        return text
+
+    def parse_page(self, html: str) -> Optional[Transcript]:
+        return self._page_result(self._submit(_parse_page, html).result())
+
+    def parse_script(self, content: str) -> Optional[Transcript]:
+        return self._page_result(self._submit(_parse_script, content).result())
+
+    def clean_captions(self, captions: Captions) -> Captions:
+        return self._submit(clean_captions, captions).result()
+
+    async def _asubmit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # The asyncio engine waits on its own semaphore so that a full queue
+        # suspends the coroutine rather than blocking the event loop.
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.queue_size)
+        async with self._async_slots:
+            return await asyncio.wrap_future(self._pool.submit(fn, *args))
+
+    async def aparse_page(self, html: str) -> Optional[Transcript]:
+        return self._page_result(await self._asubmit(_parse_page, html))
+
+    async def aparse_script(self, content: str) -> Optional[Transcript]:
+        return self._page_result(await self._asubmit(_parse_script, content))
+
+    async def aclean_captions(self, captions: Captions) -> Captions:
+        return await self._asubmit(clean_captions, captions)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
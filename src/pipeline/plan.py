@@ -0,0 +1,82 @@
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Optional, Set
+
+from extractor.utils import extract_video_id
+
+ErrorReporter = Callable[[str, List[str], Exception], None]
+
+class InputPlanner:
+    """
+    Canonicalize a stream of inputs into video IDs to fetch, lazily.
+
+    Iterating the planner runs extract_video_id once per input and yields
+    each distinct video ID once. Later inputs naming an in-flight video are
+    attached to it; inputs naming a video that already finished are settled
+    on the spot (dropped after a success, reported with the same error after
+    a failure). Invalid inputs and IDs in `skip` never reach a worker.
+
+    `report_error(key, originals, exc)` is called for invalid inputs and for
+    late duplicates of failed videos. The planner is not thread-safe: it must
+    be iterated and finished from one thread, which is what the engines do.
+    """
+
+    def __init__(self, items: Iterable[str], report_error: ErrorReporter, skip: Collection[str] = ()):
+        self.items = items
+        self.report_error = report_error
+        self.skip = skip
+        self.inputs = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.skipped = 0
+        self._pending: Dict[str, List[str]] = {}
+        # Finished IDs as 16-byte digests: millions of them stay cheap.
+        self._succeeded: Set[bytes] = set()
+        self._failed: Dict[bytes, Exception] = {}
+
+    def __iter__(self) -> Iterator[str]:
+        for item in self.items:
+            self.inputs += 1
+            vid = extract_video_id(item)
+            if vid is None:
+                if item in self.skip:
+                    self.skipped += 1
+                    continue
+                self.invalid += 1
+                self.report_error(item, [item], ValueError(f"Could not extract Loom video ID from '{item}'"))
+                continue
+            if vid in self.skip:
+                self.skipped += 1
+                continue
+
+            pending = self._pending.get(vid)
+            if pending is not None:
+                self.duplicates += 1
+                pending.append(item)
+                continue
+            key = bytes.fromhex(vid)
+            if key in self._succeeded:
+                self.duplicates += 1
+                continue
+            if key in self._failed:
+                self.duplicates += 1
+                self.report_error(vid, [item], self._failed[key])
+                continue
+
+            self._pending[vid] = [item]
+            yield vid
+
+    def finish(self, vid: str, error: Optional[Exception] = None) -> List[str]:
+        """
+        Mark a scheduled video done; returns every input that named it so far.
+        """
+        originals = self._pending.pop(vid, [])
+        key = bytes.fromhex(vid)
+        if error is None:
+            self._succeeded.add(key)
+        else:
+            # Drop the traceback so stored failures do not pin frames.
+            self._failed[key] = error.with_traceback(None)
+        return originals
+
+    @property
+    def videos(self) -> int:
+        return len(self._succeeded) + len(self._failed) + len(self._pending)
@@ -0,0 +1,9 @@
+"""
+The code under test runs with src/ on sys.path (as `python src/main.py`
+does); the fake Loom server and its fixtures live with the benchmarks.
+"""
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(_ROOT, "src"), os.path.join(_ROOT, "benchmarks")]
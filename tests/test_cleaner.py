@@ -0,0 +1,15 @@
+import pytest
+from bench_clean import HOUR_CAPTIONS, fuzz_corpus, legacy_clean
+from fixtures import raw_transcript
+
+from extractor.transcript_cleaner import clean_transcript
+
+CORPUS = fuzz_corpus() + [(f"hour-{seed}.txt", raw_transcript(seed, HOUR_CAPTIONS)) for seed in range(5)]
+
+@pytest.mark.parametrize("name,raw", CORPUS, ids=[name for name, _ in CORPUS])
+def test_clean_transcript_matches_the_line_by_line_cleaner(name, raw):
+    assert clean_transcript(raw) == legacy_clean(raw)
+
+@pytest.mark.parametrize("raw", ["", None, "\r\n\r\n", "00:12\n[Music]\nSpeaker 1:"])
+def test_clean_transcript_of_nothing_is_empty(raw):
+    assert clean_transcript(raw) == legacy_clean(raw) == ""
@@ -0,0 +1,39 @@
+import json
+import sys
+
+import pytest
+
+import main
+from output.shards import ShardedJsonlWriter
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_empty_input_leaves_output_untouched(monkeypatch, tmp_path, fmt):
+    inputs = tmp_path / "inputs.txt"
+    inputs.write_text("# nothing to fetch\n", encoding="utf-8")
+    out = tmp_path / f"out.{fmt}"
+    out.write_text("previous run\n", encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["main.py", "--input", str(inputs), "--output", str(out), "--format", fmt])
+    with pytest.raises(SystemExit) as exit_info:
+        main.main()
+    assert exit_info.value.code == 1
+    assert out.read_text(encoding="utf-8") == "previous run\n"
+
+@pytest.mark.parametrize("compression", ["zstd", "gzip"])
+def test_clean_reads_a_sharded_archive(tmp_path, compression):
+    writer = ShardedJsonlWriter(str(tmp_path / "out.jsonl"), shard_rows=2, compression=compression)
+    for i in range(5):
+        writer.write({"videoId": f"v{i}", "transcript": "stale", "raw": f"00:01\nSpeaker 1: line {i}"})
+    writer.close()
+    shards = [s["file"] for s in json.loads((tmp_path / "out.manifest.json").read_text(encoding="utf-8"))["shards"]]
+
+    for source, expected in ((tmp_path / "out.manifest.json", range(5)), (tmp_path / shards[1], range(2, 4))):
+        cleaned = tmp_path / "cleaned.jsonl"
+        main.clean_main(["--input", str(source), "--output", str(cleaned), "--workers", "1", "--no-cache"])
+        rows = [json.loads(line) for line in cleaned.read_text(encoding="utf-8").splitlines()]
+        assert [(r["videoId"], r["transcript"]) for r in rows] == [(f"v{i}", f"line {i}") for i in expected]
+
+def test_clean_rejects_a_missing_manifest(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main.clean_main(["--input", str(tmp_path / "out.manifest.json"), "--no-cache"])
+    assert exit_info.value.code == 2
+    assert "out.manifest.json" in capsys.readouterr().err
@@ -0,0 +1,40 @@
+import pytest
+from fixtures import video_id
+
+pytest.importorskip("h2")
+fake_loom_h2 = pytest.importorskip("fake_loom_h2")
+
+from extractor.http2_client import Http2LoomClient  # noqa: E402
+from extractor.http_pool import ConnectionStats  # noqa: E402
+from pipeline.engines import run_threaded  # noqa: E402
+
+VIDEOS = [video_id(i) for i in range(800)]
+THREADS = 128
+
+@pytest.fixture(scope="module")
+def server_url():
+    proc, url = fake_loom_h2.start_in_subprocess(latency=0.005, filler_kb=5)
+    yield url
+    proc.terminate()
+    proc.join()
+
+def test_worker_threads_share_one_client(server_url):
+    stats = ConnectionStats()
+    client = Http2LoomClient(
+        "test", 30, base_url=server_url, pool_maxsize=THREADS, connection_stats=stats, http1=False
+    )
+    fetched, failures = [], []
+    try:
+        run_threaded(
+            client.fetch,
+            VIDEOS,
+            THREADS,
+            lambda vid, res: fetched.append(vid),
+            lambda vid, e: failures.append(f"{vid}: {e!r}"),
+        )
+    finally:
+        client.close()
+    assert failures == []
+    assert len(fetched) == len(VIDEOS)
+    # All threads' requests are streams over the pool, not a connection each.
+    assert stats.opened <= 4
@@ -0,0 +1,27 @@
+import io
+import json
+
+import pytest
+
+from pipeline import inputs
+from pipeline.inputs import iter_json_array
+
+DOC = json.dumps(
+    {
+        "meta": {"items": ["nested"], "note": '"items": ["in a string"]', "total": 12345},
+        "ratio": 1.5e10,
+        "items": ["a", "b", 3],
+        "after": [1],
+    },
+    indent=1,
+)
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 7, 64 * 1024])
+def test_items_array_of_the_top_level_object(monkeypatch, chunk):
+    monkeypatch.setattr(inputs, "_CHUNK", chunk)
+    assert list(iter_json_array(io.StringIO(DOC))) == ["a", "b", "3"]
+
+@pytest.mark.parametrize("doc", ['{"meta": {"items": ["x"]}}', '{"items": 5}', "{}", '"x"', ""])
+def test_documents_without_a_top_level_items_array(doc):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(doc)))
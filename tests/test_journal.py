@@ -0,0 +1,57 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from output.journal import Journal
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Journals 1000 rows (every 7th an error), syncing once after the first 100,
+# then dies without closing anything.
+CRASH = textwrap.dedent(
+    """
+    import os, sys
+    sys.path.insert(0, sys.argv[1])
+    from output.journal import Journal
+    from output.writer import open_writer
+
+    out, fmt = sys.argv[2], sys.argv[3]
+    opts = {"batch_rows": 1000} if fmt == "sqlite" else {"append": False}
+    results = open_writer(out, fmt, fsync_seconds=3600, **opts)
+    errors = open_writer(out + ".errors.jsonl", "jsonl", lazy=True, fsync_seconds=3600)
+    journal = Journal(out + ".journal.jsonl", fsync_seconds=3600, depends_on=(results, errors))
+    journal.open(append=False)
+    for i in range(1000):
+        if i % 7:
+            results.write({"videoId": f"v{i}", "transcript": "x" * 100})
+        else:
+            errors.write({"input": f"v{i}", "error": "Unavailable: 404"})
+        journal.record(f"v{i}", bool(i % 7))
+        if i == 100:
+            journal.sync()
+    os._exit(0)
+    """
+)
+
+@pytest.mark.parametrize("fmt", ["jsonl", "sqlite"])
+def test_journal_only_claims_rows_that_reached_the_output(tmp_path, fmt):
+    out = str(tmp_path / f"out.{fmt}")
+    subprocess.run([sys.executable, "-c", CRASH, SRC, out, fmt], check=True)
+
+    done, failed = Journal(out + ".journal.jsonl").load()
+    assert len(done) + len(failed) == 101
+    if fmt == "sqlite":
+        with sqlite3.connect(out) as db:
+            saved = {row[0] for row in db.execute("SELECT video_id FROM transcripts")}
+    else:
+        with open(out, encoding="utf-8") as f:
+            saved = {json.loads(line)["videoId"] for line in f}
+    with open(out + ".errors.jsonl", encoding="utf-8") as f:
+        reported = {json.loads(line)["input"] for line in f}
+    assert done <= saved
+    assert failed <= reported
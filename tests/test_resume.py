@@ -0,0 +1,51 @@
+import json
+import sqlite3
+import sys
+
+import pytest
+from fake_loom import FakeLoomServer
+from fixtures import video_id
+
+import main
+
+PRIVATE = [video_id(2000 + i) for i in range(6)]
+PUBLIC = [video_id(i) for i in range(12)]
+
+@pytest.fixture(scope="module")
+def server():
+    srv = FakeLoomServer(latency=0).start()
+    srv.private.update(PRIVATE)
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def _run(monkeypatch, server, tmp_path, vids, *args):
+    inputs = tmp_path / "inputs.txt"
+    inputs.write_text("".join(v + "\n" for v in vids), encoding="utf-8")
+    config = main.load_settings(main.Path(main.__file__).resolve().parent / "config")
+    config.update(base_url=server.base_url, strategy_stats_path=None, cache_dir=None)
+    monkeypatch.setattr(main, "load_settings", lambda config_dir: config)
+    monkeypatch.setattr(sys, "argv", ["main.py", "--input", str(inputs), "--no-cache", *args])
+    with pytest.raises(SystemExit) as exit_info:
+        main.main()
+    assert exit_info.value.code == 0
+
+def _jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+@pytest.mark.parametrize("fmt", ["jsonl", "sqlite"])
+def test_resume_keeps_results_and_errors(monkeypatch, server, tmp_path, fmt):
+    out = tmp_path / f"out.{'db' if fmt == 'sqlite' else 'jsonl'}"
+    first = PUBLIC[:6] + PRIVATE[:3]
+    second = first + PUBLIC[6:] + PRIVATE[3:]
+    _run(monkeypatch, server, tmp_path, first, "--output", str(out), "--format", fmt)
+    _run(monkeypatch, server, tmp_path, second, "--output", str(out), "--format", fmt, "--resume")
+
+    if fmt == "sqlite":
+        with sqlite3.connect(out) as db:
+            done = sorted(row[0] for row in db.execute("SELECT video_id FROM transcripts"))
+    else:
+        done = sorted(row["videoId"] for row in _jsonl(out))
+    assert done == sorted(PUBLIC)
+    errors = _jsonl(out.with_suffix(".errors.jsonl"))
+    assert len(errors) == len(PRIVATE)
@@ -0,0 +1,51 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from output.shards import ShardedJsonlWriter, _read_lines
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Writes 25 rows in shards of 10, syncs, then dies mid-write without closing.
+CRASH = textwrap.dedent(
+    """
+    import os, sys
+    sys.path.insert(0, sys.argv[1])
+    from output.shards import ShardedJsonlWriter
+
+    w = ShardedJsonlWriter(sys.argv[2], shard_rows=10, compression=sys.argv[3])
+    for i in range(25):
+        w.write({"videoId": f"v{i}", "transcript": "x" * 100})
+    w.sync()
+    w._shard.raw._f.write(b"\\x00torn-tail")
+    w._shard.raw._f.flush()
+    os._exit(0)
+    """
+)
+
+@pytest.mark.parametrize("compression", ["zstd", "gzip", "none"])
+def test_resume_recovers_rows_of_an_unfinished_shard(tmp_path, compression):
+    out = tmp_path / "out.jsonl"
+    subprocess.run([sys.executable, "-c", CRASH, SRC, str(out), compression], check=True)
+    manifest = json.loads((tmp_path / "out.manifest.json").read_text(encoding="utf-8"))
+    assert manifest["rows"] == 20 and manifest["open"]
+
+    w = ShardedJsonlWriter(str(out), shard_rows=10, compression=compression, append=True)
+    for i in range(25, 30):
+        w.write({"videoId": f"v{i}", "transcript": "x" * 100})
+    w.close()
+
+    manifest = json.loads((tmp_path / "out.manifest.json").read_text(encoding="utf-8"))
+    assert manifest["rows"] == 30 and "open" not in manifest
+    ids = []
+    for shard in manifest["shards"]:
+        path = tmp_path / shard["file"]
+        assert hashlib.sha256(path.read_bytes()).hexdigest() == shard["sha256"]
+        ids += [json.loads(line)["videoId"] for line in _read_lines(path)]
+    assert ids == [f"v{i}" for i in range(30)]
+    assert not list(tmp_path.glob("*.partial"))
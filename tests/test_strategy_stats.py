@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from fake_loom import FakeLoomServer
+from fixtures import video_id
+
+from extractor.async_client import AsyncLoomClient
+from extractor.loom_client import LoomClient, LoomError
+from extractor.strategy_stats import StrategyStats
+
+PRIVATE = [video_id(1000 + i) for i in range(12)]
+PUBLIC = [video_id(i) for i in range(20)]
+
+@pytest.fixture(scope="module")
+def server():
+    srv = FakeLoomServer(latency=0).start()
+    srv.private.update(PRIVATE)
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def _fetch_all(fetch, vids):
+    ok = 0
+    for vid in vids:
+        try:
+            fetch(vid)
+            ok += 1
+        except LoomError:
+            pass
+    return ok
+
+def test_private_videos_do_not_mark_strategies_dead(server):
+    stats = StrategyStats()
+    client = LoomClient(user_agent="test", base_url=server.base_url, strategy_stats=stats)
+    assert _fetch_all(client.fetch, PRIVATE) == 0
+    # A 404 page is no verdict on the strategy.
+    assert "share_page" not in stats.snapshot()
+    assert _fetch_all(client.fetch, PUBLIC) == len(PUBLIC)
+    assert stats.snapshot()["share_page"] == {"attempts": len(PUBLIC), "hits": len(PUBLIC)}
+
+def test_async_private_videos_do_not_mark_strategies_dead(server):
+    stats = StrategyStats()
+
+    async def run():
+        client = AsyncLoomClient(user_agent="test", base_url=server.base_url, strategy_stats=stats)
+        try:
+            results = []
+            for vids in (PRIVATE, PUBLIC):
+                ok = 0
+                for vid in vids:
+                    try:
+                        await client.fetch(vid)
+                        ok += 1
+                    except LoomError:
+                        pass
+                results.append(ok)
+            return results
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == [0, len(PUBLIC)]
+    assert stats.snapshot()["share_page"] == {"attempts": len(PUBLIC), "hits": len(PUBLIC)}
+
+def test_dead_strategies_are_still_tried_last(server):
+    stats = StrategyStats(explore_every=10**6)
+    for _ in range(stats.min_samples):
+        stats.record("share_page", False)
+    client = LoomClient(user_agent="test", base_url=server.base_url, strategy_stats=stats)
+    assert client._strategies(PUBLIC[0])[-1][0] == "share_page"
+    assert client.fetch(PUBLIC[0])[0] == "share_page"
+
+def test_exploration_puts_dead_strategies_back_in_place():
+    names = ["a", "b", "c"]
+    stats = StrategyStats(explore_every=3)
+    for _ in range(stats.min_samples):
+        stats.record("a", False)
+        stats.record("b", True)
+    assert stats.order(names) == ["b", "c", "a"]
+    assert stats.order(names) == ["b", "c", "a"]
+    assert stats.order(names) == ["a", "b", "c"]
+    assert stats.order(names) == ["b", "c", "a"]